@@ -4,20 +4,39 @@
 import os
 import json
 import time
-import requests
 import getpass
+import hashlib
+import argparse
 import sys
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson  # Opcional: decodificación JSON más rápida
+except ImportError:
+    orjson = None
 
 # Constantes
 CONFIG_DIR = os.path.join(str(Path.home()), '.github_manager')
 CONFIG_FILE = os.path.join(CONFIG_DIR, 'config.json')
+ETAG_CACHE_FILE = os.path.join(CONFIG_DIR, 'etag_cache.json')
+FORKS_CACHE_FILE = os.path.join(CONFIG_DIR, 'forks_cache.json')
 LOG_FILE = os.path.join(str(Path.home()), 'github_manager.log')
 GITHUB_API_URL = 'https://api.github.com'
-RATE_LIMIT_PAUSE = 2
+GITHUB_GRAPHQL_URL = f'{GITHUB_API_URL}/graphql'
+GITHUB_USER_URL = f'{GITHUB_API_URL}/user'
+REPO_URL = (GITHUB_API_URL + '/repos/{}').format
+RATE_LIMIT_THRESHOLD = 10  # peticiones restantes a partir de las cuales se espera al reset
+DELETE_INTERVAL = 1  # segundos mínimos entre DELETEs (límite secundario de GitHub)
+VALIDATION_TTL = 24 * 60 * 60  # segundos que se reutiliza una validación del token
+FORKS_CACHE_TTL = 5 * 60  # segundos que se reutiliza la lista de forks guardada
 API_TIMEOUT = 10
+MAX_CONCURRENT_DELETES = 5
+USER_AGENT = 'gh-forks-manager/2.0'
+FORKS_PAGE_SIZE = 100  # máximo que admite la API GraphQL por página
 
 # Configuración de logging
 logging.basicConfig(
@@ -28,6 +47,92 @@ logging.basicConfig(
 )
 logger = logging.getLogger('github_fork_manager')
 
+# Consulta GraphQL: solo los forks propios y los campos que se muestran
+FORKS_QUERY = """
+query($first: Int!, $cursor: String) {
+  viewer {
+    repositories(first: $first, after: $cursor, ownerAffiliations: OWNER, isFork: true,
+                 orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { nameWithOwner stargazerCount forkCount }
+    }
+  }
+}
+"""
+
+# Sesión HTTP compartida: reutiliza conexiones keep-alive entre peticiones.
+# requests se importa en el primer uso para que --help y los errores de
+# argumentos no paguen su coste de importación.
+_session = None
+
+def get_session():
+    """Devuelve la sesión HTTP compartida, creándola en el primer uso."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
+        _session = requests.Session()
+        _session.headers.update({
+            'Accept': 'application/vnd.github.v3+json',
+            'User-Agent': USER_AGENT
+        })
+        _session.mount('https://', HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+        ))
+    return _session
+
+def authorize_session(token: str):
+    """Fija el token en la sesión compartida para todas las peticiones."""
+    get_session().headers['Authorization'] = f'token {token}'
+
+def json_loads(data):
+    """Decodifica JSON con orjson si está disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Codifica JSON con orjson si está disponible."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+def wait_for_rate_limit(r: 'requests.Response') -> bool:
+    """Espera solo si las cabeceras de GitHub lo exigen; devuelve True si conviene reintentar."""
+    throttled = r.status_code in (403, 429)
+    
+    if throttled and 'Retry-After' in r.headers:
+        wait = int(r.headers['Retry-After'])
+    elif int(r.headers.get('X-RateLimit-Remaining', RATE_LIMIT_THRESHOLD + 1)) <= RATE_LIMIT_THRESHOLD:
+        wait = max(0, int(r.headers.get('X-RateLimit-Reset', 0)) - int(time.time()))
+    else:
+        return False
+    
+    logger.warning(f"Límite de API alcanzado, esperando {wait}s")
+    print(f"{Colors.YELLOW}Límite de API alcanzado. Esperando {wait} segundos...{Colors.END}")
+    time.sleep(wait)
+    return throttled
+
+class RequestPacer:
+    """Mantiene un intervalo mínimo entre peticiones lanzadas desde varios hilos."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
 # Colores
 class Colors:
     HEADER = '\033[95m'
@@ -39,43 +144,116 @@ class Colors:
     UNDERLINE = '\033[4m'
     END = '\033[0m'
 
+# Marcas de estado precalculadas para las líneas de progreso
+OK_MARK = f"{Colors.GREEN}✓{Colors.END}"
+FAIL_CODE_MARK = f"{Colors.RED}✗ (Código: %d){Colors.END}"
+FAIL_CONNECTION_MARK = f"{Colors.RED}✗ Error de conexión{Colors.END}"
+FAIL_UNEXPECTED_MARK = f"{Colors.RED}✗ Error inesperado{Colors.END}"
+
 def setup_config_directory():
     """Crea el directorio de configuración si no existe."""
     os.makedirs(CONFIG_DIR, exist_ok=True)
 
-def load_credentials() -> Tuple[Optional[str], Optional[str]]:
+def load_credentials() -> Dict:
     """Carga credenciales del archivo de configuración."""
     try:
         if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                credentials = json.load(f)
-            return credentials.get('username'), credentials.get('token')
-        return None, None
+            with open(CONFIG_FILE, 'rb') as f:
+                return json_loads(f.read())
+        return {}
     except Exception as e:
         logger.error(f"Error al cargar credenciales: {str(e)}")
         print(f"{Colors.RED}Error al cargar credenciales: {str(e)}{Colors.END}")
-        return None, None
+        return {}
 
-def save_credentials(username: str, token: str) -> bool:
+def token_fingerprint(token: str) -> str:
+    """Huella corta del token para detectar si cambió sin volver a validarlo."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+def save_credentials(username: str, token: str, quiet: bool = False) -> bool:
     """Guarda las credenciales en el archivo de configuración."""
     credentials = {
         'username': username,
         'token': token,
-        'last_used': time.strftime("%Y-%m-%d %H:%M:%S")
+        'last_used': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'validated_at': time.time(),
+        'token_sha256': token_fingerprint(token)
     }
     
     try:
         with open(CONFIG_FILE, 'w') as f:
-            json.dump(credentials, f, indent=2)
+            f.write(json_dumps(credentials, indent=True))
         os.chmod(CONFIG_FILE, 0o600)  # Solo lectura/escritura para el propietario
         logger.info(f"Credenciales guardadas para el usuario {username}")
-        print(f"{Colors.GREEN}✓ Credenciales guardadas en {CONFIG_FILE}{Colors.END}")
+        if not quiet:
+            print(f"{Colors.GREEN}✓ Credenciales guardadas en {CONFIG_FILE}{Colors.END}")
         return True
     except Exception as e:
         logger.error(f"Error al guardar credenciales: {str(e)}")
         print(f"{Colors.RED}Error al guardar credenciales: {str(e)}{Colors.END}")
         return False
 
+def validation_is_fresh(credentials: Dict) -> bool:
+    """Indica si el token guardado se validó hace menos de VALIDATION_TTL."""
+    token = credentials.get('token')
+    validated_at = credentials.get('validated_at')
+    if not token or not validated_at:
+        return False
+    if credentials.get('token_sha256') != token_fingerprint(token):
+        return False
+    return time.time() - validated_at < VALIDATION_TTL
+
+def invalidate_validation():
+    """Descarta la validación guardada para forzar una nueva en el próximo uso."""
+    credentials = load_credentials()
+    if credentials.pop('validated_at', None) is None:
+        return
+    try:
+        with open(CONFIG_FILE, 'w') as f:
+            f.write(json_dumps(credentials, indent=True))
+        logger.info("Validación de credenciales invalidada")
+    except Exception as e:
+        logger.error(f"Error al invalidar la validación: {str(e)}")
+
+def _load_etag_cache() -> Dict[str, Dict]:
+    """Carga la caché de respuestas con ETag."""
+    try:
+        with open(ETAG_CACHE_FILE, 'rb') as f:
+            return json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def _save_etag_cache(cache: Dict[str, Dict]):
+    """Guarda la caché de respuestas con ETag."""
+    try:
+        with open(ETAG_CACHE_FILE, 'w') as f:
+            f.write(json_dumps(cache))
+        os.chmod(ETAG_CACHE_FILE, 0o600)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché de ETag: {str(e)}")
+
+def conditional_get(url: str):
+    """GET condicional: si GitHub responde 304 se reutiliza el cuerpo guardado."""
+    cache = _load_etag_cache()
+    entry = cache.get(url)
+    
+    request_headers = {'If-None-Match': entry['etag']} if entry else None
+    
+    # Las respuestas 304 no consumen el límite de tasa principal de la API
+    r = get_session().get(url, headers=request_headers, timeout=API_TIMEOUT)
+    if r.status_code == 304 and entry:
+        logger.debug(f"Respuesta sin cambios (304) para {url}")
+        return entry['body']
+    
+    r.raise_for_status()
+    body = json_loads(r.content)
+    
+    etag = r.headers.get('ETag')
+    if etag:
+        cache[url] = {'etag': etag, 'body': body}
+        _save_etag_cache(cache)
+    return body
+
 def get_user_credentials() -> Tuple[str, str]:
     """Solicita al usuario sus credenciales de GitHub."""
     print(f"\n{Colors.HEADER}Configuración de credenciales de GitHub{Colors.END}")
@@ -93,25 +271,20 @@ def get_user_credentials() -> Tuple[str, str]:
     
     return username, token
 
-def validate_token(username: str, token: str) -> Dict[str, str]:
+def validate_token(username: str, token: str):
     """Valida el token de GitHub."""
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
+    import requests
+    
+    authorize_session(token)
     
     try:
         print(f"{Colors.YELLOW}Validando credenciales...{Colors.END}")
-        r = requests.get(f"{GITHUB_API_URL}/user", headers=headers, timeout=API_TIMEOUT)
-        r.raise_for_status()
-        
-        user_data = r.json()
+        user_data = conditional_get(GITHUB_USER_URL)
         if user_data['login'].lower() != username.lower():
             raise Exception(f"El token no pertenece al usuario '{username}'. Pertenece a '{user_data['login']}'")
         
         print(f"{Colors.GREEN}✓ Credenciales validadas correctamente para {username}{Colors.END}")
         logger.info(f"Credenciales validadas correctamente para el usuario {username}")
-        return headers
         
     except requests.exceptions.RequestException as e:
         error_message = f"Error de conexión: {str(e)}"
@@ -129,83 +302,157 @@ def validate_token(username: str, token: str) -> Dict[str, str]:
         print(f"{Colors.RED}Error: {str(e)}{Colors.END}")
         sys.exit(1)
 
-def fetch_forks(headers: Dict[str, str]) -> List[Dict]:
+def fetch_forks() -> List[Dict]:
     """Obtiene todos los forks del usuario."""
+    import requests
+    
     print(f"{Colors.YELLOW}Obteniendo lista de forks...{Colors.END}")
     forks = []
-    page = 1
+    seen = set()
+    cursor = None
     
     while True:
         try:
-            params = {
-                'page': page,
-                'per_page': 100,
-                'sort': 'full_name',
-                'affiliation': 'owner'
-            }
-            
-            r = requests.get(f"{GITHUB_API_URL}/user/repos", headers=headers, params=params, timeout=API_TIMEOUT)
+            payload = {'query': FORKS_QUERY, 'variables': {'first': FORKS_PAGE_SIZE, 'cursor': cursor}}
+            r = get_session().post(GITHUB_GRAPHQL_URL, json=payload, timeout=API_TIMEOUT)
+            # Un 403/429 por límite de tasa se espera y se repite antes de tratarlo como error
+            while wait_for_rate_limit(r):
+                logger.warning("Reintentando página de forks")
+                r = get_session().post(GITHUB_GRAPHQL_URL, json=payload, timeout=API_TIMEOUT)
             r.raise_for_status()
-            repos = r.json()
-            
-            if not repos:
-                break
-                
-            # Filtrar solo los forks
-            page_forks = [repo for repo in repos if repo.get('fork')]
-            forks.extend(page_forks)
-            
-            page += 1
-            time.sleep(RATE_LIMIT_PAUSE)
+            data = json_loads(r.content)
             
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error al obtener repositorios (página {page}): {str(e)}")
+            if e.response is not None and e.response.status_code == 401:
+                invalidate_validation()
+            logger.error(f"Error al obtener repositorios: {str(e)}")
             print(f"{Colors.RED}Error al obtener repositorios: {str(e)}{Colors.END}")
             sys.exit(1)
+        
+        if data.get('errors'):
+            message = data['errors'][0].get('message', 'respuesta GraphQL inválida')
+            logger.error(f"Error GraphQL al obtener forks: {message}")
+            print(f"{Colors.RED}Error al obtener repositorios: {message}{Colors.END}")
+            sys.exit(1)
+        
+        repositories = data['data']['viewer']['repositories']
+        nodes = repositories['nodes']
+        
+        # Adaptar los nodos al formato de la API REST que usa el resto del script.
+        # Si se crea un repo durante la paginación el cursor puede repetir nodos.
+        for node in nodes:
+            if node['nameWithOwner'] in seen:
+                continue
+            seen.add(node['nameWithOwner'])
+            forks.append({
+                'full_name': node['nameWithOwner'],
+                'fork': True,
+                'stargazers_count': node['stargazerCount'],
+                'forks_count': node['forkCount']
+            })
+        
+        # Una página incompleta es siempre la última: no hace falta pedir otra
+        page_info = repositories['pageInfo']
+        if not page_info['hasNextPage'] or len(nodes) < FORKS_PAGE_SIZE:
+            break
+        cursor = page_info['endCursor']
     
     logger.info(f"Se encontraron {len(forks)} forks")
     return forks
 
+def load_cached_forks(username: str) -> Optional[List[Dict]]:
+    """Devuelve la lista de forks guardada si es reciente y del mismo usuario."""
+    try:
+        if time.time() - os.path.getmtime(FORKS_CACHE_FILE) >= FORKS_CACHE_TTL:
+            return None
+        with open(FORKS_CACHE_FILE, 'rb') as f:
+            cache = json_loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    if cache.get('username') != username:
+        return None
+    return cache.get('forks')
+
+def save_cached_forks(username: str, forks: List[Dict]):
+    """Guarda la lista de forks para reutilizarla en ejecuciones cercanas."""
+    try:
+        with open(FORKS_CACHE_FILE, 'w') as f:
+            f.write(json_dumps({'username': username, 'forks': forks}))
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché de forks: {str(e)}")
+
+def invalidate_cached_forks():
+    """Elimina la lista de forks guardada."""
+    try:
+        os.remove(FORKS_CACHE_FILE)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"No se pudo eliminar la caché de forks: {str(e)}")
+
+def get_forks(username: str, refresh: bool = False) -> List[Dict]:
+    """Obtiene los forks desde la caché local o, si no es válida, desde la API."""
+    if not refresh:
+        forks = load_cached_forks(username)
+        if forks is not None:
+            print(f"{Colors.YELLOW}Usando lista de forks en caché (usa --refresh para actualizarla){Colors.END}")
+            logger.info(f"Usando {len(forks)} forks de la caché local")
+            return forks
+    
+    forks = fetch_forks()
+    save_cached_forks(username, forks)
+    return forks
+
 def print_forks(forks: List[Dict]):
     """Imprime la lista de forks."""
     if not forks:
         print(f"{Colors.YELLOW}No tienes forks para mostrar.{Colors.END}")
         return
     
-    print(f"\n{Colors.BOLD}Forks encontrados: {len(forks)}{Colors.END}")
-    print(f"{Colors.BOLD}{'#':<3} {'Nombre del repositorio':<50} {'⭐':<6} {'🍴':<6}{Colors.END}")
-    print("-" * 70)
-    
-    for i, repo in enumerate(forks, start=1):
-        print(f"{i:2d}. {repo['full_name']:<50} {repo['stargazers_count']:<6} {repo['forks_count']:<6}")
+    # Se construye toda la tabla y se escribe de una sola vez
+    lines = [
+        f"\n{Colors.BOLD}Forks encontrados: {len(forks)}{Colors.END}",
+        f"{Colors.BOLD}{'#':<3} {'Nombre del repositorio':<50} {'⭐':<6} {'🍴':<6}{Colors.END}",
+        "-" * 70
+    ]
+    lines.extend(
+        f"{i:2d}. {repo['full_name']:<50} {repo['stargazers_count']:<6} {repo['forks_count']:<6}"
+        for i, repo in enumerate(forks, start=1)
+    )
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
 def parse_selection(selection: str, max_index: int) -> List[int]:
     """Parsea entradas como '1 3 5-7'."""
     if not selection.strip():
         return []
     
-    result = []
+    result = set()
+    ignored = 0
     try:
         for part in selection.split():
             if '-' in part:
-                start, end = map(int, part.split('-'))
-                if start > end:
-                    start, end = end, start
-                result.extend(range(start, end + 1))
+                start, end = sorted(map(int, part.split('-')))
+                # Recortar el rango a los índices válidos antes de expandirlo
+                low, high = max(1, start), min(max_index, end)
+                result.update(range(low, high + 1))
+                ignored += (end - start + 1) - max(0, high - low + 1)
             else:
-                result.append(int(part))
+                index = int(part)
+                if 1 <= index <= max_index:
+                    result.add(index)
+                else:
+                    ignored += 1
     except ValueError:
         raise ValueError("Formato de selección inválido. Use números separados por espacios o rangos como '1-5'")
     
-    # Filtrar índices válidos
-    valid_indices = [i for i in result if 1 <= i <= max_index]
-    if len(valid_indices) != len(result):
-        invalid_count = len(result) - len(valid_indices)
-        print(f"{Colors.YELLOW}Advertencia: Se ignoraron {invalid_count} índices inválidos.{Colors.END}")
+    if ignored:
+        print(f"{Colors.YELLOW}Advertencia: Se ignoraron {ignored} índices inválidos.{Colors.END}")
     
-    return valid_indices
+    return sorted(result)
 
-def delete_forks(headers: Dict[str, str], forks: List[Dict]):
+def delete_forks(forks: List[Dict]):
     """Permite al usuario eliminar forks."""
     if not forks:
         print(f"{Colors.YELLOW}No hay forks para eliminar.{Colors.END}")
@@ -227,7 +474,7 @@ def delete_forks(headers: Dict[str, str], forks: List[Dict]):
             confirm = input(f"{Colors.RED}¿Estás absolutamente seguro? Escribe 'ELIMINAR' para confirmar: {Colors.END}")
             
             if confirm == 'ELIMINAR':
-                _delete_repos(headers, forks)
+                _delete_repos(forks)
             else:
                 print(f"{Colors.YELLOW}Operación cancelada.{Colors.END}")
                 
@@ -247,7 +494,7 @@ def delete_forks(headers: Dict[str, str], forks: List[Dict]):
                         
                         confirm = input(f"\n{Colors.RED}¿Confirmas la eliminación de {len(selected)} fork(s)? (s/n): {Colors.END}")
                         if confirm.lower() == 's':
-                            _delete_repos(headers, selected)
+                            _delete_repos(selected)
                         else:
                             print(f"{Colors.YELLOW}Operación cancelada.{Colors.END}")
                     else:
@@ -268,41 +515,64 @@ def delete_forks(headers: Dict[str, str], forks: List[Dict]):
         logger.error(f"Error en delete_forks: {str(e)}")
         print(f"{Colors.RED}Error inesperado: {str(e)}{Colors.END}")
 
-def _delete_repos(headers: Dict[str, str], repos: List[Dict]):
+def _delete_one(name: str, pacer: RequestPacer) -> 'requests.Response':
+    """Elimina un repositorio; reintenta una vez si GitHub pide esperar."""
+    # La API GraphQL de GitHub no ofrece una mutación para borrar repositorios,
+    # así que las eliminaciones no pueden agruparse y usan DELETE /repos/{name}.
+    url = REPO_URL(name)
+    pacer.wait()
+    r = get_session().delete(url, timeout=API_TIMEOUT)
+    
+    if wait_for_rate_limit(r):
+        logger.warning(f"Reintentando eliminación de {name}")
+        pacer.wait()
+        r = get_session().delete(url, timeout=API_TIMEOUT)
+    
+    return r
+
+def _delete_repos(repos: List[Dict]):
     """Elimina repositorios vía API."""
+    import requests
+    
     print(f"\n{Colors.BOLD}Iniciando eliminación de {len(repos)} repositorio(s)...{Colors.END}")
     
     success_count = 0
     error_count = 0
+    total = len(repos)
     
-    for i, repo in enumerate(repos, 1):
-        name = repo['full_name']
-        print(f"[{i}/{len(repos)}] Eliminando {name}... ", end='', flush=True)
+    # Las eliminaciones son independientes: se lanzan en paralelo con un máximo
+    # de MAX_CONCURRENT_DELETES peticiones simultáneas, espaciadas DELETE_INTERVAL
+    pacer = RequestPacer(DELETE_INTERVAL)
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DELETES) as executor:
+        futures = {executor.submit(_delete_one, repo['full_name'], pacer): repo['full_name'] for repo in repos}
         
-        try:
-            r = requests.delete(f"{GITHUB_API_URL}/repos/{name}", headers=headers, timeout=API_TIMEOUT)
+        for i, future in enumerate(as_completed(futures), 1):
+            name = futures[future]
             
-            if r.status_code == 204:
-                print(f"{Colors.GREEN}✓{Colors.END}")
-                logger.info(f"Eliminado fork: {name}")
-                success_count += 1
-            else:
-                print(f"{Colors.RED}✗ (Código: {r.status_code}){Colors.END}")
-                logger.error(f"No se pudo eliminar {name}: HTTP {r.status_code} - {r.text}")
-                error_count += 1
+            try:
+                r = future.result()
                 
-        except requests.exceptions.RequestException as e:
-            print(f"{Colors.RED}✗ Error de conexión{Colors.END}")
-            logger.error(f"Error de conexión al eliminar {name}: {str(e)}")
-            error_count += 1
-        except Exception as e:
-            print(f"{Colors.RED}✗ Error inesperado{Colors.END}")
-            logger.error(f"Error inesperado al eliminar {name}: {str(e)}")
-            error_count += 1
-        
-        # Pausa para evitar límites de API
-        if i < len(repos):  # No pausar después del último
-            time.sleep(RATE_LIMIT_PAUSE)
+                if r.status_code == 204:
+                    mark = OK_MARK
+                    logger.info(f"Eliminado fork: {name}")
+                    success_count += 1
+                else:
+                    if r.status_code == 401:
+                        invalidate_validation()
+                    mark = FAIL_CODE_MARK % r.status_code
+                    logger.error(f"No se pudo eliminar {name}: HTTP {r.status_code} - {r.text}")
+                    error_count += 1
+                    
+            except requests.exceptions.RequestException as e:
+                mark = FAIL_CONNECTION_MARK
+                logger.error(f"Error de conexión al eliminar {name}: {str(e)}")
+                error_count += 1
+            except Exception as e:
+                mark = FAIL_UNEXPECTED_MARK
+                logger.error(f"Error inesperado al eliminar {name}: {str(e)}")
+                error_count += 1
+            
+            print(f"[{i}/{total}] Eliminando {name}... {mark}")
     
     # Resumen de resultados
     print(f"\n{Colors.BOLD}Resumen de eliminación:{Colors.END}")
@@ -311,12 +581,26 @@ def _delete_repos(headers: Dict[str, str], repos: List[Dict]):
         print(f"{Colors.RED}✗ Con errores: {error_count}{Colors.END}")
     
     if success_count > 0:
+        # La lista guardada ya no refleja los forks del usuario
+        invalidate_cached_forks()
         print(f"\n{Colors.GREEN}Se eliminaron {success_count} fork(s) exitosamente.{Colors.END}")
     if error_count > 0:
         print(f"{Colors.RED}Hubo {error_count} error(es). Revisa el archivo de log para más detalles.{Colors.END}")
 
+def parse_arguments():
+    """Procesa los argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description='GitHub Forks Manager para Termux')
+    parser.add_argument('--force-validate', action='store_true',
+                        help='Valida el token con la API aunque exista una validación reciente')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Ignora la lista de forks en caché y la vuelve a obtener')
+    
+    return parser.parse_args()
+
 def main():
     """Función principal."""
+    args = parse_arguments()
+    
     print(f"{Colors.BOLD}{Colors.BLUE}🔧 GitHub Forks Manager (Termux Edition){Colors.END}")
     print(f"{Colors.YELLOW}Versión 2.0 - Gestión automática de configuración{Colors.END}\n")
     
@@ -325,26 +609,33 @@ def main():
         setup_config_directory()
         
         # Cargar o solicitar credenciales
-        username, token = load_credentials()
+        credentials = load_credentials()
+        username, token = credentials.get('username'), credentials.get('token')
         
         if not username or not token:
             # No hay credenciales guardadas, solicitarlas
             username, token = get_user_credentials()
             
             # Validar las nuevas credenciales
-            headers = validate_token(username, token)
+            validate_token(username, token)
             
             # Guardar credenciales si son válidas
             if save_credentials(username, token):
                 print(f"{Colors.GREEN}Las credenciales se han guardado para futuros usos.{Colors.END}")
+        elif not args.force_validate and validation_is_fresh(credentials):
+            # Validación reciente del mismo token: se evita la petición a /user
+            print(f"{Colors.GREEN}Credenciales encontradas para el usuario: {username}{Colors.END}")
+            authorize_session(token)
+            logger.info(f"Usando validación reciente para el usuario {username}")
         else:
             # Validar credenciales existentes
             print(f"{Colors.GREEN}Credenciales encontradas para el usuario: {username}{Colors.END}")
-            headers = validate_token(username, token)
+            validate_token(username, token)
+            save_credentials(username, token, quiet=True)
         
         # Obtener y gestionar forks
-        forks = fetch_forks(headers)
-        delete_forks(headers, forks)
+        forks = get_forks(username, refresh=args.refresh)
+        delete_forks(forks)
         
     except KeyboardInterrupt:
         print(f"\n\n{Colors.GREEN}¡Hasta pronto!{Colors.END}")
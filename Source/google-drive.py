@@ -4,49 +4,54 @@
 import argparse
 import sys
 import re
-import gdown
-from rich.console import Console
-from rich.panel import Panel
-from rich.traceback import install
 
-install()
-console = Console()
+# rich y gdown se importan en el primer uso: su carga es lenta en Termux
+# y no hace falta para --help ni para errores de argumentos.
+_console = None
+
+def console():
+    """Devuelve la consola de rich, creándola en el primer uso."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        from rich.traceback import install
+        install()
+        _console = Console()
+    return _console
+
+# Formatos admitidos: /file/d/<id>, /open?id=<id> y /uc?id=<id>
+DRIVE_ID_PATTERN = re.compile(r"https?://drive\.google\.com/(?:file/d/|open\?id=|uc\?id=)([a-zA-Z0-9_-]+)")
 
 def extract_drive_id(url: str) -> str:
     """
     Extrae el ID del archivo desde una URL de Google Drive.
     """
-    patterns = [
-        r"https?://drive\.google\.com/file/d/([a-zA-Z0-9_-]+)",
-        r"https?://drive\.google\.com/open\?id=([a-zA-Z0-9_-]+)",
-        r"https?://drive\.google\.com/uc\?id=([a-zA-Z0-9_-]+)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    match = DRIVE_ID_PATTERN.search(url)
+    return match.group(1) if match else None
 
 def download_file(url: str, output: str = None, resume: bool = False,
                   quiet: bool = False, speed: str = None, proxy: str = None) -> None:
     """
     Descarga un archivo desde Google Drive, asegurando que se use el ID real del archivo.
     """
+    import gdown
+    from rich.panel import Panel
+
     try:
         file_id = extract_drive_id(url)
         if not file_id:
-            console.print(Panel(f"[bold red]No se pudo extraer el ID del archivo desde la URL:[/bold red] {url}"))
+            console().print(Panel(f"[bold red]No se pudo extraer el ID del archivo desde la URL:[/bold red] {url}"))
             sys.exit(1)
 
         file_url = f"https://drive.google.com/uc?id={file_id}"
-        console.print(Panel(f"[bold green]Iniciando descarga del archivo:[/bold green] {file_url}"))
+        console().print(Panel(f"[bold green]Iniciando descarga del archivo:[/bold green] {file_url}"))
 
         gdown.download(url=file_url, output=output, quiet=quiet,
                        resume=resume, proxy=proxy, speed=speed, fuzzy=False)
 
-        console.print(Panel(f"[bold cyan]Descarga completada exitosamente.[/bold cyan]"))
+        console().print(Panel(f"[bold cyan]Descarga completada exitosamente.[/bold cyan]"))
     except Exception as e:
-        console.print(Panel(f"[bold red]Error al descargar el archivo:[/bold red] {e}"), style="red")
+        console().print(Panel(f"[bold red]Error al descargar el archivo:[/bold red] {e}"), style="red")
         sys.exit(1)
 
 def download_folder(url: str, output: str = None, quiet: bool = False,
@@ -54,13 +59,16 @@ def download_folder(url: str, output: str = None, quiet: bool = False,
     """
     Descarga una carpeta desde Google Drive.
     """
+    import gdown
+    from rich.panel import Panel
+
     try:
-        console.print(Panel(f"[bold green]Iniciando descarga de la carpeta:[/bold green] {url}"))
+        console().print(Panel(f"[bold green]Iniciando descarga de la carpeta:[/bold green] {url}"))
         gdown.download_folder(url=url, output=output, quiet=quiet,
                               remaining_ok=remaining_ok, proxy=proxy, speed=speed)
-        console.print(Panel(f"[bold cyan]Descarga de la carpeta completada exitosamente.[/bold cyan]"))
+        console().print(Panel(f"[bold cyan]Descarga de la carpeta completada exitosamente.[/bold cyan]"))
     except Exception as e:
-        console.print(Panel(f"[bold red]Error al descargar la carpeta:[/bold red] {e}"), style="red")
+        console().print(Panel(f"[bold red]Error al descargar la carpeta:[/bold red] {e}"), style="red")
         sys.exit(1)
 
 def main():
@@ -5,9 +5,13 @@ import os
 import json
 import getpass
 import requests
+from requests.adapters import HTTPAdapter
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 import time
+import random
+import re
 import logging
 from typing import Dict, List, Tuple, Optional, Any, Union
 from functools import lru_cache
@@ -15,15 +19,33 @@ from dataclasses import dataclass
 from enum import Enum
 import signal
 
+try:
+    import orjson  # Opcional: decodificación JSON más rápida
+except ImportError:
+    orjson = None
+
 # Configuración de logging
+# Nivel WARNING por defecto; GHM_LOGLEVEL=INFO (o DEBUG) para un registro detallado
 logging.basicConfig(
-    level=logging.INFO,
+    level=getattr(logging, os.environ.get('GHM_LOGLEVEL', 'WARNING').upper(), logging.WARNING),
     format='%(asctime)s - %(levelname)s - %(message)s',
     filename=os.path.join(str(Path.home()), 'github_manager.log'),
     filemode='a'
 )
 logger = logging.getLogger('/data/data/com.termux/files/home/github_manager')
 
+def json_loads(data):
+    """Decodifica JSON con orjson si está disponible."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def json_dumps(obj) -> str:
+    """Codifica JSON con orjson si está disponible."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
 # Definición de colores ANSI para terminal
 class Colors:
     HEADER = '\033[95m'
@@ -35,12 +57,42 @@ class Colors:
     UNDERLINE = '\033[4m'
     END = '\033[0m'
 
+# Plantilla de fila para los listados de repositorios
+REPO_ROW_TEMPLATE = (
+    f"{Colors.BOLD}{{i:3d}}{Colors.END}. {{name:<40}} "
+    f"[{{color}}{{status}}{Colors.END}] "
+    f"🌟 {{stars:<4}} "
+    f"🍴 {{forks}}\n"
+)
+
 # Definición de constantes
 GITHUB_API_URL = 'https://api.github.com'
+GITHUB_GRAPHQL_URL = f'{GITHUB_API_URL}/graphql'
 CONFIG_DIR = os.path.join(str(Path.home()), '.github_manager')
 CONFIG_FILE = os.path.join(CONFIG_DIR, 'config.json')
 API_TIMEOUT = 10  # segundos
-RATE_LIMIT_PAUSE = 2  # segundos entre peticiones para evitar límites de API
+RATE_LIMIT_THRESHOLD = 10  # peticiones restantes a partir de las cuales se espera al reset
+MAX_CONCURRENT_PATCHES = 8  # cambios de visibilidad simultáneos
+HTTP_POOL_SIZE = MAX_CONCURRENT_PATCHES  # conexiones keep-alive a api.github.com
+REPOS_PAGE_SIZE = 100  # máximo que admite la API GraphQL por página
+STATS_CACHE_TTL = 60  # segundos que se reutilizan las estadísticas del menú principal
+CLEAR_WITH_ANSI = os.name == 'posix'  # en Windows se mantiene 'cls'
+_SEL_RE = re.compile(r'(\d+)(?:\s*-\s*(\d+))?')  # índices y rangos de una selección
+
+# Consulta GraphQL: solo los campos que usa Repository
+REPOSITORIES_QUERY = """
+query($first: Int!, $cursor: String) {
+  viewer {
+    repositories(first: $first, after: $cursor,
+                 affiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 ownerAffiliations: [OWNER, COLLABORATOR, ORGANIZATION_MEMBER],
+                 orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name nameWithOwner isPrivate isFork stargazerCount forkCount }
+    }
+  }
+}
+"""
 
 # Definición de tipos de repositorios
 class RepoType(Enum):
@@ -48,7 +100,7 @@ class RepoType(Enum):
     PRIVATE = "privado"
     FORK = "fork"
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Repository:
     """Clase para almacenar información de repositorios."""
     name: str
@@ -61,15 +113,15 @@ class Repository:
     
     @classmethod
     def from_api(cls, repo_data: Dict[str, Any]) -> 'Repository':
-        """Crea un objeto Repository desde los datos de la API de GitHub."""
+        """Crea un objeto Repository desde un nodo de la API GraphQL de GitHub."""
         return cls(
             name=repo_data['name'],
-            full_name=repo_data['full_name'],
-            private=repo_data['private'],
-            fork=repo_data['fork'],
-            stars=repo_data['stargazers_count'],
-            forks=repo_data['forks_count'],
-            visibility="privado" if repo_data['private'] else "público"
+            full_name=repo_data['nameWithOwner'],
+            private=repo_data['isPrivate'],
+            fork=repo_data['isFork'],
+            stars=repo_data['stargazerCount'],
+            forks=repo_data['forkCount'],
+            visibility="privado" if repo_data['isPrivate'] else "público"
         )
 
 class GitHubManager:
@@ -79,6 +131,17 @@ class GitHubManager:
         self.username = None
         self.token = None
         self.headers = None
+        self._stats_cache = None  # (instante, (total, públicos, privados))
+        self.user_etag = None     # ETag de la última respuesta de /user validada
+        self._etag_owner = None   # (usuario, token) a los que corresponde el ETag
+        self._etag_dirty = False  # ETag nuevo pendiente de guardar
+        
+        # Sesión HTTP compartida: reutiliza conexiones keep-alive entre peticiones.
+        # El pool tiene tantas conexiones como hilos de PATCH, así ningún hilo abre
+        # (y descarta) una conexión TLS extra durante los cambios masivos.
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, pool_block=True))
+        
         self.repositories = {
             RepoType.PUBLIC: [],
             RepoType.PRIVATE: [],
@@ -91,6 +154,52 @@ class GitHubManager:
         # Configurar manejador de señales para salida controlada
         signal.signal(signal.SIGINT, self._handle_exit)
     
+    def close(self):
+        """Cierra las conexiones abiertas de la sesión HTTP."""
+        self.session.close()
+    
+    def _wait_for_rate_limit(self, response: requests.Response) -> bool:
+        """Espera solo si las cabeceras de GitHub lo exigen; devuelve True si conviene reintentar."""
+        throttled = response.status_code in (403, 429)
+        
+        if throttled and 'Retry-After' in response.headers:
+            wait = int(response.headers['Retry-After'])
+        elif int(response.headers.get('X-RateLimit-Remaining', RATE_LIMIT_THRESHOLD + 1)) < RATE_LIMIT_THRESHOLD:
+            wait = max(0, int(response.headers.get('X-RateLimit-Reset', 0)) - int(time.time()))
+        else:
+            return False
+        
+        logger.warning("Límite de API alcanzado, esperando %ss", wait)
+        time.sleep(wait)
+        return throttled
+    
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Realiza una petición con la sesión respetando los límites de tasa de GitHub."""
+        response = self.session.request(method, url, **kwargs)
+        if self._wait_for_rate_limit(response):
+            response = self.session.request(method, url, **kwargs)
+        return response
+    
+    def _request_with_retry(self, method: str, url: str, *, max_retries: int = 3,
+                            base: float = 1.0, cap: float = 30.0, **kwargs) -> requests.Response:
+        """Como _request, pero reintenta errores transitorios con espera exponencial y jitter."""
+        for attempt in range(max_retries + 1):
+            try:
+                response = self._request(method, url, **kwargs)
+                # Errores 4xx (401, 403, 404...) no se arreglan reintentando
+                if response.status_code < 500 or attempt == max_retries:
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt == max_retries:
+                    raise
+                reason = str(e)
+            
+            # Primer reintento inmediato; después espera exponencial con jitter
+            delay = 0 if attempt == 0 else min(cap, base * 2 ** attempt) * (1 + random.random() * 0.5)
+            logger.warning("Error transitorio en %s %s (%s), reintento %s en %.1fs", method, url, reason, attempt + 1, delay)
+            time.sleep(delay)
+    
     def _handle_exit(self, signum, frame):
         """Maneja la salida controlada del programa."""
         print(f"\n\n{Colors.GREEN}¡Hasta pronto!{Colors.END}")
@@ -98,7 +207,12 @@ class GitHubManager:
         
     def clear_screen(self):
         """Limpia la pantalla de la terminal."""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        if CLEAR_WITH_ANSI:
+            # Secuencia ANSI: evita lanzar un subproceso en cada redibujado
+            sys.stdout.write('\033[H\033[2J')
+            sys.stdout.flush()
+        else:
+            os.system('cls')
         
     def print_banner(self):
         """Muestra el banner de la aplicación."""
@@ -112,32 +226,43 @@ class GitHubManager:
         """Carga las credenciales guardadas."""
         try:
             if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, 'r') as f:
-                    credentials = json.load(f)
-                return credentials.get('username'), credentials.get('token')
+                with open(CONFIG_FILE, 'rb') as f:
+                    credentials = json_loads(f.read())
+                username, token = credentials.get('username'), credentials.get('token')
+                self.user_etag = credentials.get('etag')
+                self._etag_owner = (username, token)
+                return username, token
             return None, None
         except Exception as e:
-            logger.error(f"Error al cargar credenciales: {str(e)}")
+            logger.error("Error al cargar credenciales: %s", e)
             print(f"{Colors.RED}Error al cargar credenciales: {str(e)}{Colors.END}")
             return None, None
             
-    def save_credentials(self, username: str, token: str) -> bool:
+    def save_credentials(self, username: str, token: str, quiet: bool = False) -> bool:
         """Guarda las credenciales en el archivo de configuración."""
         credentials = {
             'username': username,
             'token': token,
             'last_used': time.strftime("%Y-%m-%d %H:%M:%S")
         }
+        if self.user_etag and self._etag_owner == (username, token):
+            credentials['etag'] = self.user_etag
         
         try:
-            with open(CONFIG_FILE, 'w') as f:
-                json.dump(credentials, f)
-            os.chmod(CONFIG_FILE, 0o600)  # Solo lectura/escritura para el propietario
-            logger.info(f"Credenciales guardadas para el usuario {username}")
-            print(f"{Colors.GREEN}✓ Credenciales guardadas en {CONFIG_FILE}{Colors.END}")
+            # Escritura atómica: un fichero temporal que reemplaza al original
+            tmp_file = CONFIG_FILE + '.tmp'
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(json_dumps(credentials))
+            os.chmod(tmp_file, 0o600)  # Solo lectura/escritura para el propietario
+            os.replace(tmp_file, CONFIG_FILE)
+            self._etag_dirty = False
+            logger.info("Credenciales guardadas para el usuario %s", username)
+            if not quiet:
+                print(f"{Colors.GREEN}✓ Credenciales guardadas en {CONFIG_FILE}{Colors.END}")
             return True
         except Exception as e:
-            logger.error(f"Error al guardar credenciales: {str(e)}")
+            logger.error("Error al guardar credenciales: %s", e)
             print(f"{Colors.RED}Error al guardar credenciales: {str(e)}{Colors.END}")
             return False
             
@@ -148,27 +273,46 @@ class GitHubManager:
             'Accept': 'application/vnd.github.v3+json'
         }
         
+        # Petición condicional: el ETag solo es válido para el mismo usuario y token
+        request_headers = dict(headers)
+        use_etag = bool(self.user_etag) and self._etag_owner == (username, token)
+        if use_etag:
+            request_headers['If-None-Match'] = self.user_etag
+        
         try:
-            response = requests.get(
+            response = self._request_with_retry(
+                'GET',
                 f'{GITHUB_API_URL}/user', 
-                headers=headers, 
+                headers=request_headers, 
                 timeout=API_TIMEOUT
             )
-            response.raise_for_status()
             
-            # Verificar que el usuario coincide
-            user_data = response.json()
-            if user_data['login'].lower() != username.lower():
-                logger.warning(f"El token proporcionado no pertenece al usuario {username}")
-                print(f"{Colors.RED}Error: El token proporcionado no pertenece al usuario {username}.{Colors.END}")
-                return False
+            if use_etag and response.status_code == 304:
+                # Sin cambios desde la última validación: no hace falta decodificar el cuerpo
+                logger.info("Respuesta de /user sin cambios (304) para el usuario %s", username)
+            else:
+                response.raise_for_status()
                 
-            # Guardar los headers para uso posterior
+                # Verificar que el usuario coincide
+                user_data = json_loads(response.content)
+                if user_data['login'].lower() != username.lower():
+                    logger.warning("El token proporcionado no pertenece al usuario %s", username)
+                    print(f"{Colors.RED}Error: El token proporcionado no pertenece al usuario {username}.{Colors.END}")
+                    return False
+                
+                etag = response.headers.get('ETag')
+                if etag and (etag != self.user_etag or self._etag_owner != (username, token)):
+                    self.user_etag = etag
+                    self._etag_owner = (username, token)
+                    self._etag_dirty = True
+                
+            # Guardar los headers en la sesión para uso posterior
             self.headers = headers
+            self.session.headers.update(headers)
             self.username = username
             self.token = token
             
-            logger.info(f"Credenciales validadas correctamente para el usuario {username}")
+            logger.info("Credenciales validadas correctamente para el usuario %s", username)
             print(f"{Colors.GREEN}✓ Credenciales validadas correctamente.{Colors.END}")
             return True
         except requests.exceptions.RequestException as e:
@@ -176,10 +320,10 @@ class GitHubManager:
             if hasattr(e, 'response') and e.response is not None:
                 if e.response.status_code == 401:
                     error_message = f"{Colors.RED}Error: Token inválido o caducado.{Colors.END}"
-                    logger.error(f"Token inválido para el usuario {username}")
+                    logger.error("Token inválido para el usuario %s", username)
                 elif e.response.status_code == 403:
                     error_message = f"{Colors.RED}Error: Acceso denegado. Verifica los permisos del token.{Colors.END}"
-                    logger.error(f"Permisos insuficientes para el token del usuario {username}")
+                    logger.error("Permisos insuficientes para el token del usuario %s", username)
             print(error_message)
             return False
             
@@ -209,60 +353,66 @@ class GitHubManager:
                 RepoType.FORK: []
             }
             
+            # Referencias locales a las listas y sus append para el bucle de clasificación
+            public, private, forks = [], [], []
+            add_public, add_private, add_fork = public.append, private.append, forks.append
+            
             print(f"{Colors.BOLD}Obteniendo lista de repositorios...{Colors.END}")
             
-            # Obtener los repositorios paginados
-            page = 1
-            total_repos = []
+            # Obtener los repositorios paginados por cursor; cada página se
+            # clasifica al llegar, sin acumular las respuestas completas
+            cursor = None
+            total_count = 0
             
             while True:
                 try:
-                    response = requests.get(
-                        f'{GITHUB_API_URL}/user/repos', 
-                        headers=self.headers, 
-                        params={
-                            'page': page,
-                            'per_page': 100,
-                            'sort': 'full_name',
-                            'affiliation': 'owner,collaborator,organization_member'
-                        },
+                    response = self._request_with_retry(
+                        'POST',
+                        GITHUB_GRAPHQL_URL,
+                        json={'query': REPOSITORIES_QUERY, 'variables': {'first': REPOS_PAGE_SIZE, 'cursor': cursor}},
                         timeout=API_TIMEOUT
                     )
                     response.raise_for_status()
-                    repos = response.json()
-                    
-                    if not repos:  # No hay más repositorios
-                        break
-                        
-                    total_repos.extend(repos)
-                    page += 1
-                    
-                    # Pausar brevemente para evitar límites de API
-                    time.sleep(RATE_LIMIT_PAUSE)
+                    data = json_loads(response.content)
                     
                 except requests.exceptions.RequestException as e:
-                    logger.error(f"Error en la petición de repositorios (página {page}): {str(e)}")
+                    logger.error("Error en la petición de repositorios: %s", e)
                     if hasattr(e, 'response') and e.response:
-                        logger.error(f"Respuesta de la API: {e.response.text}")
+                        logger.error("Respuesta de la API: %s", e.response.text)
                     print(f"{Colors.RED}Error al obtener repositorios: {str(e)}{Colors.END}")
                     return False
-            
-            # Clasificar los repositorios
-            for repo_data in total_repos:
-                repo = Repository.from_api(repo_data)
                 
-                if repo.fork:
-                    self.repositories[RepoType.FORK].append(repo)
-                elif repo.private:
-                    self.repositories[RepoType.PRIVATE].append(repo)
-                else:
-                    self.repositories[RepoType.PUBLIC].append(repo)
+                if data.get('errors'):
+                    message = data['errors'][0].get('message', 'respuesta GraphQL inválida')
+                    logger.error("Error GraphQL al obtener repositorios: %s", message)
+                    print(f"{Colors.RED}Error al obtener repositorios: {message}{Colors.END}")
+                    return False
+                
+                repositories = data['data']['viewer']['repositories']
+                nodes = repositories['nodes']
+                total_count += len(nodes)
+                
+                # Clasificar los repositorios de la página
+                for repo_data in nodes:
+                    add = add_fork if repo_data['isFork'] else add_private if repo_data['isPrivate'] else add_public
+                    add(Repository.from_api(repo_data))
+                
+                # Sin página siguiente (o con una página incompleta) no hay más datos
+                if not repositories['pageInfo']['hasNextPage'] or len(nodes) < REPOS_PAGE_SIZE:
+                    break
+                cursor = repositories['pageInfo']['endCursor']
             
-            logger.info(f"Obtenidos {len(total_repos)} repositorios para el usuario {self.username}")
+            self.repositories = {
+                RepoType.PUBLIC: public,
+                RepoType.PRIVATE: private,
+                RepoType.FORK: forks
+            }
+            
+            logger.info("Obtenidos %s repositorios para el usuario %s", total_count, self.username)
             return True
             
         except Exception as e:
-            logger.error(f"Error inesperado al obtener repositorios: {str(e)}")
+            logger.error("Error inesperado al obtener repositorios: %s", e)
             print(f"{Colors.RED}Error inesperado al obtener repositorios: {str(e)}{Colors.END}")
             return False
             
@@ -287,12 +437,13 @@ class GitHubManager:
         def print_repo_list(repos: List[Repository], status_color: str, status_text: str):
             if not repos:
                 return
-                
-            for i, repo in enumerate(repos):
-                print(f"{Colors.BOLD}{i+1:3d}{Colors.END}. {repo.name:<40} "
-                      f"[{status_color}{status_text}{Colors.END}] "
-                      f"🌟 {repo.stars:<4} "
-                      f"🍴 {repo.forks}")
+            
+            # Toda la lista se escribe de una vez en lugar de un print por fila
+            sys.stdout.write("".join(
+                REPO_ROW_TEMPLATE.format(i=i, name=repo.name, color=status_color,
+                                         status=status_text, stars=repo.stars, forks=repo.forks)
+                for i, repo in enumerate(repos, start=1)
+            ))
             print()
         
         # Mostrar repositorios públicos
@@ -330,21 +481,24 @@ class GitHubManager:
         make_private: bool
     ) -> Tuple[bool, str]:
         """Cambia la visibilidad de un repositorio."""
+        # La mutación GraphQL updateRepository no admite cambiar la visibilidad,
+        # así que no es posible agrupar varios cambios en una sola petición:
+        # cada repositorio usa su propio PATCH REST (en paralelo, ver _batch_change_visibility).
         new_visibility = 'private' if make_private else 'public'
         data = {'visibility': new_visibility}
         
         try:
-            response = requests.patch(
+            response = self._request_with_retry(
+                'PATCH',
                 f'{GITHUB_API_URL}/repos/{self.username}/{repo_name}',
                 json=data,
-                headers=self.headers,
                 timeout=API_TIMEOUT
             )
             response.raise_for_status()
             
             # Registrar la acción
             action = "privado" if make_private else "público"
-            logger.info(f"Repositorio '{repo_name}' cambiado a {action}")
+            logger.info("Repositorio '%s' cambiado a %s", repo_name, action)
             
             return True, new_visibility
         except requests.exceptions.RequestException as e:
@@ -473,20 +627,29 @@ class GitHubManager:
         success_count = 0
         error_count = 0
         
-        for repo in repos:
-            print(f"Cambiando '{repo.name}' a {action_text}... ", end="", flush=True)
-            success, result = self.change_repository_visibility(repo.name, make_private)
+        # Los cambios son independientes: se envían en paralelo con un máximo
+        # de MAX_CONCURRENT_PATCHES peticiones simultáneas
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_PATCHES) as executor:
+            futures = {
+                executor.submit(self.change_repository_visibility, repo.name, make_private): repo
+                for repo in repos
+            }
             
-            if success:
-                print(f"{Colors.GREEN}✓{Colors.END}")
-                success_count += 1
-            else:
-                print(f"{Colors.RED}✗{Colors.END}")
-                print(f"{Colors.RED}{result}{Colors.END}")
-                error_count += 1
+            for future in as_completed(futures):
+                repo = futures[future]
+                success, result = future.result()
                 
-            # Pausar brevemente para evitar límites de API
-            time.sleep(RATE_LIMIT_PAUSE)
+                if success:
+                    print(f"Cambiando '{repo.name}' a {action_text}... {Colors.GREEN}✓{Colors.END}")
+                    success_count += 1
+                else:
+                    print(f"Cambiando '{repo.name}' a {action_text}... {Colors.RED}✗{Colors.END}")
+                    print(f"{Colors.RED}{result}{Colors.END}")
+                    error_count += 1
+        
+        # Los contadores de públicos/privados han cambiado
+        if success_count > 0:
+            self._stats_cache = None
         
         print(f"\n{Colors.GREEN}Completado: {success_count} repositorios cambiados a {action_text}s.{Colors.END}")
         if error_count > 0:
@@ -494,54 +657,61 @@ class GitHubManager:
     
     def _process_selection(self, selection: str, repos: List[Repository], make_private: bool):
         """Procesa la selección de repositorios específicos."""
-        selected_indices = []
+        selected_indices = set()
+        out_of_range = 0
         
-        # Procesar la selección (admite rangos como "1-5")
-        for part in selection.split():
-            if '-' in part:
-                try:
-                    start, end = map(int, part.split('-'))
-                    selected_indices.extend(range(start, end + 1))
-                except ValueError:
-                    # Ignorar partes no válidas
-                    pass
-            else:
-                try:
-                    selected_indices.append(int(part))
-                except ValueError:
-                    # Ignorar partes no válidas
-                    pass
+        # Procesar la selección (admite rangos como "1-5"); lo que no encaja se ignora
+        for start, end in _SEL_RE.findall(selection):
+            start = int(start)
+            end = int(end) if end else start
+            # Recortar el rango a los índices válidos antes de expandirlo; el conjunto
+            # evita cambiar dos veces (y en paralelo) el mismo repositorio
+            low, high = max(1, start), min(len(repos), end)
+            selected_indices.update(range(low, high + 1))
+            out_of_range += max(0, end - start + 1) - max(0, high - low + 1)
+        
+        if out_of_range:
+            print(f"{Colors.RED}{out_of_range} índices fuera de rango, ignorando.{Colors.END}")
         
         if not selected_indices:
             print(f"{Colors.YELLOW}No se seleccionó ningún repositorio válido.{Colors.END}")
             return
-            
-        action_text = "privado" if make_private else "público"
-        success_count = 0
-        error_count = 0
         
-        for idx in selected_indices:
-            if 1 <= idx <= len(repos):
-                repo = repos[idx-1]
-                print(f"Cambiando '{repo.name}' a {action_text}... ", end="", flush=True)
-                success, result = self.change_repository_visibility(repo.name, make_private)
-                
-                if success:
-                    print(f"{Colors.GREEN}✓{Colors.END}")
-                    success_count += 1
-                else:
-                    print(f"{Colors.RED}✗{Colors.END}")
-                    print(f"{Colors.RED}{result}{Colors.END}")
-                    error_count += 1
-                    
-                # Pausar brevemente para evitar límites de API
-                time.sleep(RATE_LIMIT_PAUSE)
-            else:
-                print(f"{Colors.RED}Índice {idx} fuera de rango, ignorando.{Colors.END}")
+        selected = [repos[idx-1] for idx in sorted(selected_indices)]
         
-        print(f"\n{Colors.GREEN}Completado: {success_count} repositorios cambiados a {action_text}s.{Colors.END}")
-        if error_count > 0:
-            print(f"{Colors.RED}{error_count} repositorios no pudieron ser modificados.{Colors.END}")
+        self._batch_change_visibility(selected, make_private)
+    
+    def _get_user_stats(self) -> Optional[Tuple[int, int, int]]:
+        """Obtiene (total, públicos, privados) del usuario, con caché de STATS_CACHE_TTL segundos."""
+        now = time.monotonic()
+        if self._stats_cache and now - self._stats_cache[0] < STATS_CACHE_TTL:
+            return self._stats_cache[1]
+        
+        try:
+            response = self._request(
+                'GET',
+                f'{GITHUB_API_URL}/users/{self.username}',
+                timeout=API_TIMEOUT
+            )
+            if response.status_code != 200:
+                return None
+            public_repos = json_loads(response.content).get('public_repos', 0)
+            
+            # Para obtener repositorios privados necesitamos otra petición
+            private_response = self._request(
+                'GET',
+                f'{GITHUB_API_URL}/user', 
+                timeout=API_TIMEOUT
+            )
+            if private_response.status_code != 200:
+                return None
+            private_repos = json_loads(private_response.content).get('total_private_repos', 0)
+        except (requests.exceptions.RequestException, ValueError):
+            return None
+        
+        stats = (public_repos + private_repos, public_repos, private_repos)
+        self._stats_cache = (now, stats)
+        return stats
     
     def run(self):
         """Ejecuta el programa principal."""
@@ -558,45 +728,23 @@ class GitHubManager:
             else:
                 print(f"{Colors.RED}No se pudieron validar las credenciales. Saliendo...{Colors.END}")
                 sys.exit(1)
+        elif self._etag_dirty:
+            # Credenciales guardadas válidas con un ETag nuevo: persistirlo para la próxima vez
+            self.save_credentials(self.username, self.token, quiet=True)
         
         # Menú principal
         while True:
             self.print_banner()
             
             # Obtener estadísticas para mostrar en el menú principal
-            try:
-                # Intentar obtener una versión rápida de las estadísticas
-                response = requests.get(
-                    f'{GITHUB_API_URL}/users/{self.username}',
-                    headers=self.headers,
-                    timeout=API_TIMEOUT
-                )
-                if response.status_code == 200:
-                    user_data = response.json()
-                    public_repos = user_data.get('public_repos', 0)
-                    
-                    # Para obtener repositorios privados necesitamos otra petición
-                    private_repos = 0
-                    try:
-                        private_response = requests.get(
-                            f'{GITHUB_API_URL}/user', 
-                            headers=self.headers,
-                            timeout=API_TIMEOUT
-                        )
-                        if private_response.status_code == 200:
-                            private_data = private_response.json()
-                            total_repos = private_data.get('total_private_repos', 0) + public_repos
-                            private_repos = private_data.get('total_private_repos', 0)
-                    except:
-                        pass
-                    
-                    user_status = f"{Colors.BOLD}Usuario: {Colors.GREEN}{self.username}{Colors.END} | "
-                    user_status += f"{Colors.BOLD}Repos: {Colors.GREEN}{total_repos}{Colors.END} "
-                    user_status += f"({Colors.GREEN}Públicos: {public_repos} | Privados: {private_repos}{Colors.END})"
-                    print(user_status)
-                else:
-                    print(f"{Colors.BOLD}Usuario: {Colors.GREEN}{self.username}{Colors.END}")
-            except:
+            stats = self._get_user_stats()
+            if stats:
+                total_repos, public_repos, private_repos = stats
+                user_status = f"{Colors.BOLD}Usuario: {Colors.GREEN}{self.username}{Colors.END} | "
+                user_status += f"{Colors.BOLD}Repos: {Colors.GREEN}{total_repos}{Colors.END} "
+                user_status += f"({Colors.GREEN}Públicos: {public_repos} | Privados: {private_repos}{Colors.END})"
+                print(user_status)
+            else:
                 print(f"{Colors.BOLD}Usuario: {Colors.GREEN}{self.username}{Colors.END}")
             
             print(f"\n{Colors.BOLD}Menú Principal:{Colors.END}")
@@ -620,6 +768,7 @@ class GitHubManager:
                 
                 elif option == 3:
                     self.clear_screen()
+                    self._stats_cache = None
                     self.username, self.token = self.get_user_credentials()
                     if self.validate_credentials(self.username, self.token):
                         self.save_credentials(self.username, self.token)
@@ -640,6 +789,7 @@ class GitHubManager:
 
 def main():
     """Función principal."""
+    github_manager = None
     try:
         github_manager = GitHubManager()
         github_manager.run()
@@ -647,10 +797,13 @@ def main():
         print(f"\n\n{Colors.GREEN}¡Hasta pronto!{Colors.END}")
         sys.exit(0)
     except Exception as e:
-        logger.critical(f"Error inesperado: {str(e)}")
+        logger.critical("Error inesperado: %s", e)
         print(f"\n{Colors.RED}Error inesperado: {str(e)}{Colors.END}")
         print(f"{Colors.YELLOW}Este error ha sido registrado en el archivo de log.{Colors.END}")
         sys.exit(1)
+    finally:
+        if github_manager is not None:
+            github_manager.close()
 
 if __name__ == "__main__":
     main()
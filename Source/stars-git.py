@@ -5,23 +5,34 @@ import os
 import json
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import getpass
 import sys
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Any, List, Dict, Optional, Set, Tuple
 import logging
 from datetime import datetime
-import argparse
-from tabulate import tabulate
+
+try:
+    import orjson  # Opcional: serialización JSON más rápida
+except ImportError:
+    orjson = None
 
 # Constantes
 CONFIG_DIR = os.path.join(str(Path.home()), '.github_manager')
 CONFIG_FILE = os.path.join(CONFIG_DIR, 'config.json')
+ETAG_CACHE_FILE = os.path.join(CONFIG_DIR, 'etag_cache.json')  # compartida con forks.py
 LOG_FILE = os.path.join(str(Path.home()), 'github_manager.log')
 GITHUB_API_URL = 'https://api.github.com'
-RATE_LIMIT_PAUSE = 1
+GITHUB_GRAPHQL_URL = f'{GITHUB_API_URL}/graphql'
+RATE_LIMIT_THRESHOLD = 10  # peticiones restantes a partir de las cuales se espera al reset
+RATE_LIMIT_MAX_CHECKS = 3  # consultas a /rate_limit como máximo antes de continuar
+MAX_CONCURRENT_UNSTARS = 8  # estrellas eliminadas a la vez
+STARRED_PAGE_SIZE = 100  # máximo que admite la API GraphQL por página
 API_TIMEOUT = 15
 USER_AGENT = 'GitHub-Stars-Manager-Termux/1.0'
+CLEAR_WITH_ANSI = os.name == 'posix'  # en Windows se mantiene 'cls'
 
 # Configuración de logging
 logging.basicConfig(
@@ -32,6 +43,39 @@ logging.basicConfig(
 )
 logger = logging.getLogger('github_stars_manager')
 
+# Consulta GraphQL: una petición por cada 100 estrellas, tópicos incluidos
+STARRED_QUERY = """
+query($login: String!, $first: Int!, $cursor: String) {
+  user(login: $login) {
+    starredRepositories(first: $first, after: $cursor, orderBy: {field: STARRED_AT, direction: DESC}) {
+      pageInfo { endCursor hasNextPage }
+      nodes {
+        databaseId
+        nameWithOwner
+        description
+        url
+        primaryLanguage { name }
+        stargazerCount
+        forkCount
+        updatedAt
+        repositoryTopics(first: 20) { nodes { topic { name } } }
+      }
+    }
+  }
+}
+"""
+
+# Sesión HTTP compartida: mantiene las conexiones keep-alive con api.github.com.
+# Una conexión por hilo de eliminación; pool_block evita abrir conexiones TLS sobrantes.
+SESSION = requests.Session()
+SESSION.headers.update({'User-Agent': USER_AGENT})
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=MAX_CONCURRENT_UNSTARS,
+    pool_block=True,
+    max_retries=Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+))
+
 # Colores
 class Colors:
     GREEN = '\033[92m'
@@ -44,48 +88,111 @@ class Colors:
     UNDERLINE = '\033[4m'
     END = '\033[0m'
 
-def check_rate_limit(headers: Dict[str, str]) -> Tuple[int, int]:
+# Marcas de estado precalculadas para el bucle de eliminación
+UNSTAR_OK = f"{Colors.GREEN}✓{Colors.END}"
+UNSTAR_FAIL_CODE = f"{Colors.RED}✗ (%d){Colors.END}"
+
+# Escapado de celdas Markdown en una sola pasada (barras y saltos de línea)
+MARKDOWN_ESCAPES = str.maketrans({'|': '\\|', '\n': ' '})
+
+def _load_etag_cache() -> Dict[str, Dict]:
+    """Carga la caché de respuestas con ETag."""
+    try:
+        with open(ETAG_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_etag_cache(cache: Dict[str, Dict]):
+    """Guarda la caché de respuestas con ETag."""
+    try:
+        with open(ETAG_CACHE_FILE, 'w') as f:
+            json.dump(cache, f)
+        os.chmod(ETAG_CACHE_FILE, 0o600)
+    except OSError as e:
+        logger.warning(f"No se pudo guardar la caché de ETag: {str(e)}")
+
+def conditional_get(url: str) -> Any:
+    """GET condicional: si GitHub responde 304 se reutiliza el cuerpo guardado."""
+    cache = _load_etag_cache()
+    entry = cache.get(url)
+    
+    request_headers = {'If-None-Match': entry['etag']} if entry else None
+    
+    # Las respuestas 304 no consumen el límite de tasa principal de la API
+    r = SESSION.get(url, headers=request_headers, timeout=API_TIMEOUT)
+    if r.status_code == 304 and entry:
+        logger.debug(f"Respuesta sin cambios (304) para {url}")
+        return entry['body']
+    
+    r.raise_for_status()
+    body = r.json()
+    
+    etag = r.headers.get('ETag')
+    if etag:
+        cache[url] = {'etag': etag, 'body': body}
+        _save_etag_cache(cache)
+    return body
+
+def check_rate_limit() -> Tuple[int, int]:
     """Verifica límite de tasa de la API de GitHub y espera si es necesario."""
     try:
-        r = requests.get(f"{GITHUB_API_URL}/rate_limit", headers=headers, timeout=API_TIMEOUT)
-        r.raise_for_status()
-        data = r.json()
-        remaining = data['resources']['core']['remaining']
-        reset_time = data['resources']['core']['reset']
-        current_time = int(time.time())
-        
-        if remaining < 5:  # Si quedan menos de 5 solicitudes
-            wait_time = reset_time - current_time + 5  # Añadimos 5 segundos de margen
-            if wait_time > 0:
-                print(f"{Colors.YELLOW}Límite de API casi alcanzado. Esperando {wait_time} segundos...{Colors.END}")
-                time.sleep(wait_time)
-                return check_rate_limit(headers)  # Verificamos de nuevo después de esperar
-        
-        return remaining, reset_time
+        for _ in range(RATE_LIMIT_MAX_CHECKS):
+            r = SESSION.get(f"{GITHUB_API_URL}/rate_limit", timeout=API_TIMEOUT)
+            r.raise_for_status()
+            data = r.json()
+            remaining = data['resources']['core']['remaining']
+            reset_time = data['resources']['core']['reset']
+            
+            if remaining >= 5:  # Si quedan al menos 5 solicitudes
+                return remaining, reset_time
+            
+            wait_time = reset_time - int(time.time()) + 5  # Añadimos 5 segundos de margen
+            if wait_time <= 0:
+                return remaining, reset_time
+            print(f"{Colors.YELLOW}Límite de API casi alcanzado. Esperando {wait_time} segundos...{Colors.END}")
+            time.sleep(wait_time)  # Verificamos de nuevo después de esperar
     except Exception as e:
         logger.warning(f"Error al verificar límite de tasa: {str(e)}")
-        return 1000, 0  # Valor por defecto conservador
+    return 1000, 0  # Valor por defecto conservador
+
+def throttle(r: requests.Response) -> bool:
+    """Pausa según las cabeceras de límite de tasa; devuelve True si hay que repetir la petición."""
+    throttled = r.status_code in (403, 429)
+    if throttled and 'Retry-After' in r.headers:
+        # Límite secundario: GitHub indica exactamente cuánto esperar
+        wait_time = int(r.headers['Retry-After'])
+    else:
+        remaining = int(r.headers.get('X-RateLimit-Remaining', '1000'))
+        logger.debug(f"Solicitudes API restantes: {remaining}")
+        if remaining >= RATE_LIMIT_THRESHOLD:
+            return False
+        wait_time = max(0, int(r.headers.get('X-RateLimit-Reset', '0')) - int(time.time()) + 2)
+        throttled = throttled and remaining == 0
+    
+    print(f"\n{Colors.YELLOW}Límite de API casi alcanzado. Esperando {wait_time} segundos...{Colors.END}")
+    logger.warning(f"Límite de API alcanzado, esperando {wait_time}s")
+    time.sleep(wait_time)
+    return throttled
 
 def load_credentials() -> Dict[str, str]:
     """Carga credenciales del archivo de configuración."""
-    if not os.path.exists(CONFIG_DIR):
-        os.makedirs(CONFIG_DIR, exist_ok=True)
-        
-    if not os.path.exists(CONFIG_FILE):
-        print(f"{Colors.RED}No se encontraron credenciales guardadas.{Colors.END}")
-        setup_credentials()
-        
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    
     try:
         with open(CONFIG_FILE, 'r') as f:
             creds = json.load(f)
-            if not creds.get('username') or not creds.get('token'):
-                raise ValueError("Faltan credenciales")
-            return creds
+        if not creds.get('username') or not creds.get('token'):
+            raise ValueError("Faltan credenciales")
+        return creds
+    except FileNotFoundError:
+        print(f"{Colors.RED}No se encontraron credenciales guardadas.{Colors.END}")
     except Exception as e:
         print(f"{Colors.RED}Error al leer el archivo de credenciales: {str(e)}{Colors.END}")
-        setup_credentials()
-        with open(CONFIG_FILE, 'r') as f:
-            return json.load(f)
+    
+    setup_credentials()
+    with open(CONFIG_FILE, 'r') as f:
+        return json.load(f)
 
 def setup_credentials() -> None:
     """Configura las credenciales para la API de GitHub."""
@@ -97,9 +204,9 @@ def setup_credentials() -> None:
     token = getpass.getpass(f"{Colors.CYAN}Token de acceso personal: {Colors.END}")
     
     # Intentamos validar antes de guardar
-    headers = {'Authorization': f'token {token}', 'User-Agent': USER_AGENT}
+    headers = {'Authorization': f'token {token}'}
     try:
-        r = requests.get(f"{GITHUB_API_URL}/user", headers=headers, timeout=API_TIMEOUT)
+        r = SESSION.get(f"{GITHUB_API_URL}/user", headers=headers, timeout=API_TIMEOUT)
         r.raise_for_status()
         user_data = r.json()
         if user_data['login'].lower() != username.lower():
@@ -114,17 +221,14 @@ def setup_credentials() -> None:
         print(f"{Colors.RED}Error al validar credenciales: {str(e)}{Colors.END}")
         sys.exit(1)
 
-def validate_token(username: str, token: str) -> Dict[str, str]:
-    """Valida el token de GitHub."""
-    headers = {'Authorization': f'token {token}', 'User-Agent': USER_AGENT}
+def validate_token(username: str, token: str) -> None:
+    """Valida el token de GitHub y lo deja configurado en la sesión."""
+    SESSION.headers['Authorization'] = f'token {token}'
     try:
-        r = requests.get(f"{GITHUB_API_URL}/user", headers=headers, timeout=API_TIMEOUT)
-        r.raise_for_status()
-        user_data = r.json()
+        user_data = conditional_get(f"{GITHUB_API_URL}/user")
         if user_data['login'].lower() != username.lower():
             raise Exception("El token no coincide con el usuario")
         logger.info(f"Token validado correctamente para usuario: {username}")
-        return headers
     except requests.exceptions.HTTPError as e:
         if e.response.status_code == 401:
             print(f"{Colors.RED}Token inválido o expirado.{Colors.END}")
@@ -141,75 +245,96 @@ def validate_token(username: str, token: str) -> Dict[str, str]:
         logger.error(f"Error desconocido validando token: {str(e)}")
         sys.exit(1)
 
-def fetch_starred_repos(headers: Dict[str, str], username: str, language_filter: Optional[str] = None, topic_filter: Optional[str] = None) -> List[Dict]:
+def _repo_from_node(node: Dict) -> Dict:
+    """Convierte un nodo GraphQL al formato de repositorio de la API REST."""
+    description = node['description'] or ''
+    shown = description or 'Sin descripción'
+    markdown = shown.translate(MARKDOWN_ESCAPES)
+    return {
+        'id': node['databaseId'],
+        'full_name': node['nameWithOwner'],
+        'html_url': node['url'],
+        'description': node['description'],
+        # Descripción normalizada una sola vez para la tabla y las exportaciones CSV y Markdown
+        '_desc': description,
+        '_desc_table': shown if len(shown) <= 50 else shown[:47] + "...",
+        '_desc_md': markdown if len(markdown) <= 60 else markdown[:57] + "...",
+        'language': (node['primaryLanguage'] or {}).get('name'),
+        'stargazers_count': node['stargazerCount'],
+        'forks_count': node['forkCount'],
+        'updated_at': node['updatedAt'],
+        # Fecha ya interpretada una sola vez para filtros y tablas
+        '_updated_dt': datetime.fromisoformat(node['updatedAt'].rstrip('Z')),
+        'topics': [t['topic']['name'] for t in node['repositoryTopics']['nodes']]
+    }
+
+def _fetch_starred_page(username: str, cursor: Optional[str]) -> Dict:
+    """Descarga una página de repositorios con estrella mediante GraphQL."""
+    payload = {
+        'query': STARRED_QUERY,
+        'variables': {'login': username, 'first': STARRED_PAGE_SIZE, 'cursor': cursor}
+    }
+    # El límite de tasa viaja en las cabeceras de cada respuesta: no hace falta consultar /rate_limit
+    r = SESSION.post(GITHUB_GRAPHQL_URL, json=payload, timeout=API_TIMEOUT)
+    while throttle(r):
+        r = SESSION.post(GITHUB_GRAPHQL_URL, json=payload, timeout=API_TIMEOUT)
+    r.raise_for_status()
+    
+    data = r.json()
+    if data.get('errors'):
+        raise Exception(data['errors'][0].get('message', 'Error GraphQL'))
+    return data['data']['user']['starredRepositories']
+
+def _filter_repos(repos: List[Dict], language_filter: Optional[str], topic_filter: Optional[str]) -> List[Dict]:
+    """Aplica los filtros de lenguaje y tópico a una página de repositorios."""
+    # Filtros en minúsculas calculados una sola vez
+    lang_lc = language_filter.lower() if language_filter else None
+    topic_lc = topic_filter.lower() if topic_filter else None
+    
+    filtered_repos = []
+    for repo in repos:
+        language = repo.get('language')
+        if lang_lc and language and language.lower() != lang_lc:
+            continue
+            
+        # Los tópicos llegan en la propia respuesta de la consulta
+        if topic_lc and topic_lc not in {t.lower() for t in repo.get('topics', ())}:
+            continue
+            
+        filtered_repos.append(repo)
+    return filtered_repos
+
+def fetch_starred_repos(username: str, language_filter: Optional[str] = None, topic_filter: Optional[str] = None) -> List[Dict]:
     """Obtiene todos los repositorios con estrella del usuario."""
     starred_repos = []
-    page = 1
     total_count = 0
     
     print(f"{Colors.BOLD}Obteniendo repositorios con estrella...{Colors.END}")
     
     try:
+        # Paginación por cursor: cada consulta devuelve hasta 100 repositorios con sus tópicos
+        cursor = None
+        page = 0
         while True:
-            # Verificar límite de tasa
-            remaining, _ = check_rate_limit(headers)
-            logger.debug(f"Solicitudes API restantes: {remaining}")
-            
-            params = {
-                'page': page,
-                'per_page': 100,
-                'sort': 'created',
-                'direction': 'desc'
-            }
-            
-            url = f"{GITHUB_API_URL}/users/{username}/starred"
-            r = requests.get(url, headers=headers, params=params, timeout=API_TIMEOUT)
-            r.raise_for_status()
-            
-            repos = r.json()
+            page += 1
+            starred = _fetch_starred_page(username, cursor)
+            repos = [_repo_from_node(node) for node in starred['nodes']]
             if not repos:
                 break
                 
             # Aplicar filtros si existen
             if language_filter or topic_filter:
-                filtered_repos = []
-                for repo in repos:
-                    if language_filter and repo.get('language') and repo.get('language').lower() != language_filter.lower():
-                        continue
-                        
-                    if topic_filter:
-                        # Si necesitamos filtrar por tópico, debemos hacer una solicitud adicional
-                        topics_url = f"{GITHUB_API_URL}/repos/{repo['full_name']}/topics"
-                        topics_headers = headers.copy()
-                        topics_headers['Accept'] = 'application/vnd.github.mercy-preview+json'
-                        
-                        try:
-                            topics_r = requests.get(topics_url, headers=topics_headers, timeout=API_TIMEOUT)
-                            topics_r.raise_for_status()
-                            topics = topics_r.json().get('names', [])
-                            
-                            if topic_filter.lower() not in [t.lower() for t in topics]:
-                                continue
-                        except Exception as e:
-                            logger.warning(f"Error al obtener tópicos para {repo['full_name']}: {str(e)}")
-                            continue
-                            
-                    filtered_repos.append(repo)
-                
-                starred_repos.extend(filtered_repos)
+                starred_repos.extend(_filter_repos(repos, language_filter, topic_filter))
             else:
                 starred_repos.extend(repos)
                 
             total_count = len(starred_repos)
-            progress = min(total_count, page * 100)
+            progress = min(total_count, page * STARRED_PAGE_SIZE)
             print(f"\r{Colors.CYAN}Procesando... {progress} repositorios encontrados{Colors.END}", end='')
             
-            # Si recibimos menos de 100 repos, hemos llegado al final
-            if len(repos) < 100:
+            if not starred['pageInfo']['hasNextPage']:
                 break
-                
-            page += 1
-            time.sleep(RATE_LIMIT_PAUSE)
+            cursor = starred['pageInfo']['endCursor']
     except requests.exceptions.HTTPError as e:
         print(f"\n{Colors.RED}Error HTTP al obtener repositorios: {e.response.status_code}{Colors.END}")
         logger.error(f"Error HTTP obteniendo estrellas: {str(e)}")
@@ -224,6 +349,21 @@ def fetch_starred_repos(headers: Dict[str, str], username: str, language_filter:
     logger.info(f"Obtenidos {len(starred_repos)} repositorios con estrella")
     return starred_repos
 
+def _format_table(headers: List[str], rows: List[List]) -> str:
+    """Da formato de tabla con bordes a las filas (anchos calculados en una pasada)."""
+    rows = [[str(v) for v in row] for row in rows]
+    widths = [len(h) for h in headers]
+    for row in rows:
+        widths = [max(w, len(v)) for w, v in zip(widths, row)]
+    
+    sep = '+' + '+'.join('-' * (w + 2) for w in widths) + '+'
+    row_template = '| ' + ' | '.join(f'{{:<{w}}}' for w in widths) + ' |'
+    
+    lines = [sep, row_template.format(*headers), sep]
+    lines.extend(row_template.format(*row) for row in rows)
+    lines.append(sep)
+    return '\n'.join(lines)
+
 def print_repos_table(repos: List[Dict], show_details: bool = False):
     """Imprime la tabla de repositorios con estrella."""
     if not repos:
@@ -237,7 +377,7 @@ def print_repos_table(repos: List[Dict], show_details: bool = False):
         
     table_data = []
     for i, repo in enumerate(repos, start=1):
-        updated_at = datetime.strptime(repo['updated_at'], "%Y-%m-%dT%H:%M:%SZ").strftime("%Y-%m-%d")
+        updated_at = repo['_updated_dt'].strftime("%Y-%m-%d")
         language = repo.get('language', 'N/A')
         
         row = [
@@ -250,9 +390,7 @@ def print_repos_table(repos: List[Dict], show_details: bool = False):
         ]
         
         if show_details:
-            description = repo.get('description', 'Sin descripción')
-            if len(description) > 50:
-                description = description[:47] + "..."
+            description = repo['_desc_table']
                 
             # Obtener tópicos si están disponibles
             topics = "N/A"
@@ -266,61 +404,86 @@ def print_repos_table(repos: List[Dict], show_details: bool = False):
         table_data.append(row)
     
     print()
-    print(f"{Colors.BOLD}{tabulate(table_data, headers=headers, tablefmt='pretty')}{Colors.END}")
+    print(f"{Colors.BOLD}{_format_table(headers, table_data)}{Colors.END}")
     print(f"\nTotal: {len(repos)} repositorios")
 
 def parse_selection(selection: str, max_index: int) -> List[int]:
     """Parsea entradas como '1 3 5-7'."""
-    result = []
+    # Conjunto de índices válidos: elimina duplicados y filtra al insertar
+    result = set()
     try:
         for part in selection.split():
             if '-' in part:
                 start, end = map(int, part.split('-'))
-                result.extend(range(start, end + 1))
+                result.update(range(max(start, 1), min(end, max_index) + 1))
             else:
-                result.append(int(part))
-        # Filtrar índices válidos y eliminar duplicados
-        valid_indices = sorted(set([i for i in result if 1 <= i <= max_index]))
-        return valid_indices
+                index = int(part)
+                if 1 <= index <= max_index:
+                    result.add(index)
+        return sorted(result)
     except ValueError:
         print(f"{Colors.RED}Formato de selección inválido. Usa números y rangos (ej: 1 3 5-7).{Colors.END}")
         return []
 
-def remove_stars(headers: Dict[str, str], repos: List[Dict]):
-    """Elimina estrellas de repositorios seleccionados."""
+def _unstar_one(full_name: str) -> requests.Response:
+    """Quita la estrella de un repositorio, esperando al reset si se agota el límite."""
+    url = f"{GITHUB_API_URL}/user/starred/{full_name}"
+    r = SESSION.delete(url, timeout=API_TIMEOUT)
+    while throttle(r):
+        r = SESSION.delete(url, timeout=API_TIMEOUT)
+    return r
+
+def remove_stars(repos: List[Dict]) -> Set[int]:
+    """Elimina estrellas de repositorios seleccionados y devuelve los ids eliminados."""
+    ok_ids = set()
     if not repos:
         print(f"{Colors.YELLOW}No hay repositorios seleccionados.{Colors.END}")
-        return
+        return ok_ids
         
+    from concurrent.futures import ThreadPoolExecutor, as_completed  # Solo al eliminar estrellas
+    
     print(f"\n{Colors.BOLD}Quitando estrellas de {len(repos)} repositorios:{Colors.END}")
     successful = 0
     failed = 0
+    total = len(repos)
     
-    for i, repo in enumerate(repos, start=1):
-        full_name = repo['full_name']
-        print(f"  [{i}/{len(repos)}] Quitando estrella de {full_name}... ", end='', flush=True)
+    # Las peticiones DELETE son independientes: se envían en paralelo con un límite de hilos
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_UNSTARS) as executor:
+        futures = {executor.submit(_unstar_one, repo['full_name']): repo for repo in repos}
         
-        try:
-            url = f"{GITHUB_API_URL}/user/starred/{full_name}"
-            r = requests.delete(url, headers=headers, timeout=API_TIMEOUT)
+        for i, future in enumerate(as_completed(futures), start=1):
+            repo = futures[future]
+            full_name = repo['full_name']
             
-            if r.status_code in [204, 200]:
-                print(f"{Colors.GREEN}✓{Colors.END}")
-                logger.info(f"Estrella eliminada: {full_name}")
-                successful += 1
-            else:
-                print(f"{Colors.RED}✗ ({r.status_code}){Colors.END}")
-                logger.error(f"Error al quitar estrella de {full_name}: {r.status_code}")
+            try:
+                r = future.result()
+                
+                if r.status_code in [204, 200]:
+                    status = UNSTAR_OK
+                    logger.info(f"Estrella eliminada: {full_name}")
+                    ok_ids.add(repo['id'])
+                    successful += 1
+                else:
+                    status = UNSTAR_FAIL_CODE % r.status_code
+                    logger.error(f"Error al quitar estrella de {full_name}: {r.status_code}")
+                    failed += 1
+            except Exception as e:
+                status = f"{Colors.RED}✗ Error: {str(e)}{Colors.END}"
+                logger.error(f"Excepción al quitar estrella de {full_name}: {str(e)}")
                 failed += 1
-        except Exception as e:
-            print(f"{Colors.RED}✗ Error: {str(e)}{Colors.END}")
-            logger.error(f"Excepción al quitar estrella de {full_name}: {str(e)}")
-            failed += 1
             
-        # Pausa para respetar límites de tasa
-        time.sleep(RATE_LIMIT_PAUSE)
+            # Una sola escritura por repositorio: la línea completa con su resultado
+            sys.stdout.write(f"  [{i}/{total}] Quitando estrella de {full_name}... {status}\n")
+            sys.stdout.flush()
     
     print(f"\n{Colors.GREEN}Operación completada: {successful} exitosos, {failed} fallidos{Colors.END}")
+    return ok_ids
+
+def _export_dumps(data) -> bytes:
+    """Serializa a JSON con sangría, usando orjson si está disponible."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
 
 def export_starred_repos(repos: List[Dict], format_type: str = 'json'):
     """Exporta la lista de repositorios con estrella a un archivo."""
@@ -328,26 +491,25 @@ def export_starred_repos(repos: List[Dict], format_type: str = 'json'):
         print(f"{Colors.YELLOW}No hay repositorios para exportar.{Colors.END}")
         return
         
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
     
     if format_type == 'json':
         filename = f"github_stars_{timestamp}.json"
         # Simplificar la estructura para exportar solo los campos relevantes
-        export_data = []
-        for repo in repos:
-            export_data.append({
-                'full_name': repo['full_name'],
-                'html_url': repo['html_url'],
-                'description': repo.get('description', ''),
-                'language': repo.get('language', ''),
-                'stargazers_count': repo['stargazers_count'],
-                'forks_count': repo['forks_count'],
-                'updated_at': repo['updated_at'],
-                'topics': repo.get('topics', [])
-            })
+        export_data = [{
+            'full_name': repo['full_name'],
+            'html_url': repo['html_url'],
+            'description': repo['description'],  # null si no tiene, como en la API
+            'language': repo.get('language', ''),
+            'stargazers_count': repo['stargazers_count'],
+            'forks_count': repo['forks_count'],
+            'updated_at': repo['updated_at'],
+            'topics': repo.get('topics', [])
+        } for repo in repos]
             
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'wb') as f:
+            f.write(_export_dumps(export_data))
     
     elif format_type == 'csv':
         import csv
@@ -359,33 +521,32 @@ def export_starred_repos(repos: List[Dict], format_type: str = 'json'):
             writer.writerow(['Repositorio', 'URL', 'Descripción', 'Lenguaje', 'Estrellas', 'Forks', 'Actualizado'])
             
             # Datos
-            for repo in repos:
-                writer.writerow([
-                    repo['full_name'],
-                    repo['html_url'],
-                    repo.get('description', ''),
-                    repo.get('language', ''),
-                    repo['stargazers_count'],
-                    repo['forks_count'],
-                    repo['updated_at']
-                ])
+            writer.writerows([
+                repo['full_name'],
+                repo['html_url'],
+                repo['_desc'],
+                repo.get('language', ''),
+                repo['stargazers_count'],
+                repo['forks_count'],
+                repo['updated_at']
+            ] for repo in repos)
     
     elif format_type == 'markdown':
         filename = f"github_stars_{timestamp}.md"
         
+        lines = [
+            "# Repositorios con Estrella en GitHub\n",
+            "Exportado el: " + now.strftime("%Y-%m-%d %H:%M:%S") + "\n",
+            "| # | Repositorio | Descripción | Lenguaje | ⭐ | 🍴 |",
+            "|---|------------|-------------|----------|-----|-----|"
+        ]
+        
+        for i, repo in enumerate(repos, start=1):
+            lines.append(f"| {i} | [{repo['full_name']}]({repo['html_url']}) | {repo['_desc_md']} | {repo.get('language', 'N/A')} | {repo['stargazers_count']} | {repo['forks_count']} |")
+        
+        # Un único write con todo el documento
         with open(filename, 'w', encoding='utf-8') as f:
-            f.write("# Repositorios con Estrella en GitHub\n\n")
-            f.write("Exportado el: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S") + "\n\n")
-            
-            f.write("| # | Repositorio | Descripción | Lenguaje | ⭐ | 🍴 |\n")
-            f.write("|---|------------|-------------|----------|-----|-----|\n")
-            
-            for i, repo in enumerate(repos, start=1):
-                description = (repo.get('description', '') or 'Sin descripción').replace('|', '\\|')
-                if len(description) > 60:
-                    description = description[:57] + "..."
-                    
-                f.write(f"| {i} | [{repo['full_name']}]({repo['html_url']}) | {description} | {repo.get('language', 'N/A')} | {repo['stargazers_count']} | {repo['forks_count']} |\n")
+            f.write('\n'.join(lines) + '\n')
     
     else:
         print(f"{Colors.RED}Formato de exportación no soportado: {format_type}{Colors.END}")
@@ -420,8 +581,8 @@ def filter_starred_repos(repos: List[Dict]) -> List[Dict]:
             for i, (lang, count) in enumerate(sorted(languages.items(), key=lambda x: x[1], reverse=True), start=1):
                 print(f"{i:2d}. {lang} ({count} repos)")
                 
-            language = input("\nEscribe el nombre del lenguaje: ")
-            return [r for r in repos if r.get('language') and r.get('language').lower() == language.lower()]
+            language = input("\nEscribe el nombre del lenguaje: ").lower()
+            return [r for r in repos if r.get('language') and r['language'].lower() == language]
             
         elif choice == 2:
             min_stars = int(input("\nNúmero mínimo de estrellas: "))
@@ -432,7 +593,7 @@ def filter_starred_repos(repos: List[Dict]) -> List[Dict]:
             date_str = input("Fecha mínima: ")
             try:
                 date_threshold = datetime.strptime(date_str, "%Y-%m-%d")
-                return [r for r in repos if datetime.strptime(r['updated_at'].split('T')[0], "%Y-%m-%d") >= date_threshold]
+                return [r for r in repos if r['_updated_dt'] >= date_threshold]
             except ValueError:
                 print(f"{Colors.RED}Formato de fecha inválido. Mostrando todos los repositorios.{Colors.END}")
                 return repos
@@ -443,12 +604,21 @@ def filter_starred_repos(repos: List[Dict]) -> List[Dict]:
         print(f"{Colors.RED}Opción inválida. Mostrando todos los repositorios.{Colors.END}")
         return repos
 
-def interactive_menu(headers: Dict[str, str], username: str):
+def _clear():
+    """Limpia la pantalla de la terminal."""
+    if CLEAR_WITH_ANSI:
+        # Secuencia ANSI: evita lanzar un subproceso en cada redibujado del menú
+        sys.stdout.write('\x1b[2J\x1b[H')
+        sys.stdout.flush()
+    else:
+        os.system('cls')
+
+def interactive_menu(username: str):
     """Menú interactivo para gestionar repositorios con estrella."""
     repos = []
     
     while True:
-        os.system('clear' if os.name == 'posix' else 'cls')
+        _clear()
         
         print(f"\n{Colors.BOLD}{Colors.BLUE}🌟 GitHub Stars Manager (Termux Edition){Colors.END}")
         print(f"Usuario: {username}")
@@ -475,7 +645,7 @@ def interactive_menu(headers: Dict[str, str], username: str):
                     if input("¿Filtrar por tópico? (s/n): ").lower() == 's':
                         topic_filter = input("Tópico: ")
                 
-                repos = fetch_starred_repos(headers, username, language_filter, topic_filter)
+                repos = fetch_starred_repos(username, language_filter, topic_filter)
                 input("\nPresiona Enter para continuar...")
                 
             elif choice == 2:
@@ -527,18 +697,17 @@ def interactive_menu(headers: Dict[str, str], username: str):
                 if subchoice == 1:
                     confirm = input(f"{Colors.RED}¿Estás seguro? Esto quitará TODAS las estrellas mostradas. (s/n): {Colors.END}")
                     if confirm.lower() == 's':
-                        remove_stars(headers, repos)
+                        remove_stars(repos)
                 elif subchoice == 2:
                     selection = input("Selecciona números (ej: 1 3 5-7): ")
                     indices = parse_selection(selection, len(repos))
                     if indices:
                         selected = [repos[i-1] for i in indices]
-                        remove_stars(headers, selected)
+                        ok_ids = remove_stars(selected)
                         
-                        # Actualizar la lista principal eliminando los repos sin estrella
-                        if input(f"\n¿Quieres actualizar la lista principal? (s/n): ").lower() == 's':
-                            selected_ids = {repo['id'] for repo in selected}
-                            repos = [repo for repo in repos if repo['id'] not in selected_ids]
+                        # Actualizar la lista principal eliminando solo los repos que perdieron la estrella
+                        if ok_ids and input(f"\n¿Quieres actualizar la lista principal? (s/n): ").lower() == 's':
+                            repos[:] = [repo for repo in repos if repo['id'] not in ok_ids]
                             print(f"{Colors.GREEN}Lista principal actualizada.{Colors.END}")
                 else:
                     print(f"{Colors.YELLOW}Operación cancelada.{Colors.END}")
@@ -586,6 +755,8 @@ def interactive_menu(headers: Dict[str, str], username: str):
 
 def parse_arguments():
     """Procesa los argumentos de línea de comandos."""
+    import argparse  # Solo se necesita al arrancar
+    
     parser = argparse.ArgumentParser(description='GitHub Stars Manager para Termux')
     parser.add_argument('-l', '--language', help='Filtrar por lenguaje de programación')
     parser.add_argument('-t', '--topic', help='Filtrar por tópico')
@@ -608,14 +779,17 @@ def main():
             print(f"{Colors.RED}Faltan credenciales en el archivo de configuración.{Colors.END}")
             sys.exit(1)
             
-        headers = validate_token(username, token)
+        validate_token(username, token)
+        
+        # Comprobación previa del límite de tasa; después se sigue con las cabeceras de cada respuesta
+        check_rate_limit()
         
         # Si no hay argumentos específicos o se solicitó modo interactivo
         if args.interactive or (not args.language and not args.topic and not args.export):
-            interactive_menu(headers, username)
+            interactive_menu(username)
         else:
             # Procesar en modo no interactivo
-            repos = fetch_starred_repos(headers, username, args.language, args.topic)
+            repos = fetch_starred_repos(username, args.language, args.topic)
             
             if repos:
                 print_repos_table(repos)
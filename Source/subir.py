@@ -8,11 +8,16 @@ Desarrollado para uso en Termux y entornos SSH
 import os
 import sys
 import subprocess
-import argparse
-import re
-from datetime import datetime
-import signal
-import time
+import shlex
+
+# Tiempo de validez de la caché de ramas remotas (segundos)
+LS_REMOTE_CACHE_TTL = 30 * 60
+
+# Número de separadores antes de la ruta en cada tipo de entrada de git status --porcelain=v2
+STATUS_V2_FIELDS = {'1': 8, '2': 9, 'u': 10}
+
+# Longitud máxima (bytes) de rutas por invocación de git add
+ADD_CHUNK_BYTES = 4000
 
 # Colores ANSI para terminal
 class Colors:
@@ -26,16 +31,35 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Sin colores si la salida no es una terminal o se define NO_COLOR (https://no-color.org)
+if not sys.stdout.isatty() or os.environ.get('NO_COLOR'):
+    for _name in ('HEADER', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD', 'UNDERLINE'):
+        setattr(Colors, _name, '')
+
 class GitCommitTool:
+    _PARSER = None  # parser compartido entre instancias, creado con la primera
+
     def __init__(self):
-        self.parser = self._setup_argument_parser()
+        self.parser = type(self)._setup_argument_parser()
         self.args = None
+        self._cwd = None  # directorio de trabajo, resuelto una vez en run()
+        # Resultados memorizados por ejecución: run() los reinicia en cada llamada
+        self._repo_state = None
+        self._current_branch = None
+        self._branch_exists = {}  # (remoto, rama) → bool
         # Configurar el manejo de señales para limpieza adecuada
+        import signal
         signal.signal(signal.SIGINT, self._handle_interrupt)
         signal.signal(signal.SIGTERM, self._handle_interrupt)
 
-    def _setup_argument_parser(self):
-        """Configura el parser de argumentos de línea de comandos"""
+    @classmethod
+    def _setup_argument_parser(cls):
+        """Configura el parser de argumentos de línea de comandos (una vez por clase)"""
+        if cls._PARSER is not None:
+            return cls._PARSER
+        
+        import argparse
+        
         parser = argparse.ArgumentParser(
             description=f"{Colors.CYAN}GitCommitTool{Colors.ENDC} - Herramienta para gestionar commits y push de Git",
             formatter_class=argparse.RawDescriptionHelpFormatter
@@ -50,9 +74,16 @@ class GitCommitTool:
                           help='Solo hace commit, sin push')
         parser.add_argument('-s', '--status', action='store_true', 
                           help='Muestra estado del repositorio antes de proceder')
+        parser.add_argument('-a', '--all', action='store_true', 
+                          help='Añade con "git add ." en lugar de solo las rutas con cambios')
+        parser.add_argument('-y', '--yes', action='store_true', 
+                          help='Confirma automáticamente las operaciones')
+        parser.add_argument('-q', '--quiet', action='store_true', 
+                          help='No muestra el banner')
         parser.add_argument('-v', '--verbose', action='store_true', 
                           help='Mostrar información detallada')
         
+        cls._PARSER = parser
         return parser
 
     def _handle_interrupt(self, signum, frame):
@@ -68,25 +99,34 @@ class GitCommitTool:
 │ Facilita el manejo de commits en Git             │
 │ Para uso en Termux y entornos SSH                │
 ╰─────────────────────────────────────────────╯{Colors.ENDC}
+
 """
-        print(banner)
+        # Una sola escritura para todo el banner
+        sys.stdout.write(banner)
+        sys.stdout.flush()
 
-    def _exec_command(self, command, suppress_output=False):
-        """Ejecuta un comando de shell y maneja errores adecuadamente"""
+    def _verbose(self, message):
+        """Muestra un mensaje de detalle si se activó --verbose"""
+        if self.args and self.args.verbose:
+            print(f"{Colors.BLUE}[v] {message}{Colors.ENDC}")
+
+    def _exec_command(self, argv, suppress_output=False):
+        """Ejecuta un comando (lista de argumentos, sin shell) y maneja errores adecuadamente"""
+        command = shlex.join(argv)
         try:
             if suppress_output:
                 result = subprocess.run(
-                    command, 
-                    shell=True, 
+                    argv, 
                     text=True,
-                    capture_output=True
+                    capture_output=True,
+                    cwd=self._cwd
                 )
             else:
                 result = subprocess.run(
-                    command, 
-                    shell=True, 
+                    argv, 
                     text=True,
-                    stderr=subprocess.PIPE
+                    stderr=subprocess.PIPE,
+                    cwd=self._cwd
                 )
                 
             if result.returncode != 0:
@@ -99,32 +139,176 @@ class GitCommitTool:
             print(f"{Colors.RED}    → {str(e)}{Colors.ENDC}")
             return False, str(e)
 
-    def _validate_git_repo(self):
-        """Verifica que estamos en un repositorio Git válido"""
-        success, output = self._exec_command("git rev-parse --is-inside-work-tree", suppress_output=True)
-        if not success or output.strip() != "true":
+    def _exec_batch(self, commands):
+        """Ejecuta varios comandos en orden y se detiene en el primero que falle (como &&)"""
+        for argv in commands:
+            success, output = self._exec_command(argv)
+            if not success:
+                return False, output
+        return True, True
+
+    def _collect_repo_state(self):
+        """Obtiene rama, upstream y cambios pendientes con una sola llamada a git status"""
+        if self._repo_state is not None:
+            return self._repo_state
+        
+        # "-- ." limita las rutas al directorio actual, como hacía git add .; -uall lista
+        # cada archivo sin seguimiento aunque status.showUntrackedFiles diga otra cosa
+        result = subprocess.run(
+            ["git", "status", "--porcelain=v2", "--branch", "-z", "-uall", "--", "."],
+            capture_output=True,
+            cwd=self._cwd
+        )
+        if result.returncode != 0:
             print(f"{Colors.RED}[✗] No estás dentro de un repositorio Git válido{Colors.ENDC}")
-            return False
-        return True
+            return None
+        
+        # changes: todas las entradas; unstaged: rutas (relativas a la raíz) pendientes de git add
+        state = {'branch': None, 'oid': None, 'upstream': None, 'changes': [], 'unstaged': []}
+        # Bytes decodificados como rutas del sistema: sin traducción de saltos de línea y
+        # sin fallos con nombres que no son UTF-8 (os.fsencode los recupera intactos)
+        entries = iter(os.fsdecode(result.stdout).split('\0'))
+        for entry in entries:
+            if not entry:
+                continue
+            if entry.startswith('# branch.head '):
+                state['branch'] = entry[len('# branch.head '):]
+            elif entry.startswith('# branch.oid '):
+                state['oid'] = entry[len('# branch.oid '):]
+            elif entry.startswith('# branch.upstream '):
+                state['upstream'] = entry[len('# branch.upstream '):]
+            elif entry.startswith('#'):
+                continue
+            else:
+                state['changes'].append(entry)
+                kind = entry[0]
+                if kind == '?':
+                    state['unstaged'].append(entry[2:])
+                elif kind in '12u':
+                    fields = entry.split(' ', STATUS_V2_FIELDS[kind])
+                    if kind == '2':
+                        next(entries, None)  # ruta original del renombrado
+                    # Y == '.': sin cambios en el árbol de trabajo, ya está en el índice
+                    if fields[1][1] != '.':
+                        state['unstaged'].append(fields[-1])
+        self._repo_state = state
+        return state
 
-    def _get_current_branch(self):
-        """Obtiene el nombre de la rama actual"""
-        success, output = self._exec_command("git symbolic-ref --short HEAD 2>/dev/null || git rev-parse --short HEAD", suppress_output=True)
-        if not success:
-            print(f"{Colors.YELLOW}[!] No se pudo determinar la rama actual{Colors.ENDC}")
-            return "desconocida"
-        return output.strip()
+    def _get_current_branch(self, state):
+        """Obtiene el nombre de la rama actual a partir del estado del repositorio"""
+        if self._current_branch is None:
+            self._current_branch = self._branch_from_state(state)
+        return self._current_branch
+
+    def _branch_from_state(self, state):
+        """Deduce la rama (o el hash corto en HEAD separado) del estado de git status"""
+        branch = state['branch']
+        if branch == '(detached)':
+            # En HEAD separado se usa el hash corto del commit
+            oid = state['oid']
+            if not oid or oid == '(initial)':
+                print(f"{Colors.YELLOW}[!] No se pudo determinar la rama actual{Colors.ENDC}")
+                return "desconocida"
+            return oid[:7]
+        return branch or "desconocida"
 
     def _validate_branch_exists(self, branch, remote="origin"):
         """Verifica si la rama existe en el remoto"""
-        success, output = self._exec_command(f"git ls-remote --heads {remote} {branch}", suppress_output=True)
-        return success and branch in output
+        key = (remote, branch)
+        if key not in self._branch_exists:
+            self._branch_exists[key] = self._lookup_branch(branch, remote)
+        return self._branch_exists[key]
+
+    def _lookup_branch(self, branch, remote):
+        """Busca la rama en las referencias locales y, si no está, en el remoto"""
+        # Primero la referencia local de seguimiento: no requiere conexión
+        ref = f"refs/remotes/{remote}/{branch}"
+        result = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", ref],
+            text=True,
+            capture_output=True,
+            cwd=self._cwd
+        )
+        if result.returncode == 0:
+            self._verbose(f"Rama {remote}/{branch} encontrada en las referencias locales")
+            return True
+        
+        self._verbose(f"Rama {remote}/{branch} no conocida localmente, consultando el remoto")
+        heads = self._remote_heads(remote)
+        return heads is not None and branch in heads
+
+    def _ls_remote_cache_path(self):
+        """Ruta de la caché de ls-remote (respeta XDG_CACHE_HOME)"""
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        return os.path.join(cache_home, 'gitcommittool', 'ls-remote.json')
 
-    def _sanitize_commit_message(self, message):
-        """Sanitiza el mensaje de commit para evitar problemas con caracteres especiales"""
-        # Eliminar caracteres que pueden causar problemas en la línea de comandos
-        sanitized = re.sub(r'[`$"\'\\]', '', message)
-        return sanitized
+    def _ls_remote_cache_key(self, remote):
+        """Clave de la caché: remoto y raíz del repositorio, buscada sin lanzar git"""
+        # El nombre del remoto se repite entre repositorios, la raíz no
+        top = path = self._cwd
+        while not os.path.exists(os.path.join(path, '.git')):
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        else:
+            top = path
+        return f"{remote}@{top}"
+
+    def _load_ls_remote_cache(self):
+        """Carga la caché de ls-remote (vacía si no existe o está dañada)"""
+        import json
+        try:
+            with open(self._ls_remote_cache_path(), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_ls_remote_cache(self, cache):
+        """Guarda la caché de ls-remote de forma atómica"""
+        import json
+        cache_path = self._ls_remote_cache_path()
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = cache_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(cache, f)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self._verbose(f"No se pudo guardar la caché de ls-remote: {e}")
+
+    def _forget_remote_heads(self, remote):
+        """Descarta las ramas cacheadas del remoto (p. ej. antes de crear una rama nueva)"""
+        cache = self._load_ls_remote_cache()
+        if cache.pop(self._ls_remote_cache_key(remote), None) is not None:
+            self._save_ls_remote_cache(cache)
+
+    def _remote_heads(self, remote):
+        """Obtiene las ramas del remoto (nombre → sha), reutilizando la caché si es reciente"""
+        # Solo se necesitan cuando la rama no se conoce localmente
+        import time
+        
+        key = self._ls_remote_cache_key(remote)
+        cache = self._load_ls_remote_cache()
+        entry = cache.get(key)
+        if entry and time.time() - entry['fetched_at'] < LS_REMOTE_CACHE_TTL:
+            self._verbose(f"Ramas de {remote} obtenidas de la caché")
+            return entry['refs']
+        
+        # Una sola consulta trae todas las ramas, no solo la buscada
+        success, output = self._exec_command(["git", "ls-remote", "--heads", remote], suppress_output=True)
+        if not success:
+            return None
+        
+        refs = {}
+        for line in output.splitlines():
+            sha, _, ref = line.partition('\t')
+            if ref.startswith('refs/heads/'):
+                refs[ref[len('refs/heads/'):]] = sha
+        
+        cache[key] = {'refs': refs, 'fetched_at': time.time()}
+        self._save_ls_remote_cache(cache)
+        return refs
 
     def _get_commit_message(self):
         """Solicita un mensaje de commit al usuario o usa el proporcionado por argumento"""
@@ -135,44 +319,97 @@ class GitCommitTool:
         message = input(f"{Colors.BOLD}> {Colors.ENDC}").strip()
         
         if not message:
+            from datetime import datetime  # Solo para el mensaje automático
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             message = f"Actualización: {current_time}"
             print(f"{Colors.YELLOW}[!] Mensaje vacío, usando mensaje automático: {message}{Colors.ENDC}")
         
         return message
 
+    def _add_commands(self, paths):
+        """Genera las invocaciones de git add para las rutas indicadas, en bloques acotados"""
+        # Las rutas de git status son relativas a la raíz: se usan pathspecs :(top,literal)
+        commands = []
+        chunk, size = [], 0
+        for path in paths:
+            spec = f":(top,literal){path}"
+            # El límite es en bytes: las rutas no ASCII ocupan más que sus caracteres
+            spec_size = len(os.fsencode(spec))
+            if chunk and size + spec_size > ADD_CHUNK_BYTES:
+                commands.append(["git", "add", "--"] + chunk)
+                chunk, size = [], 0
+            chunk.append(spec)
+            size += spec_size + 1
+        if chunk:
+            commands.append(["git", "add", "--"] + chunk)
+        return commands
+
     def _show_status(self):
         """Muestra el estado actual del repositorio"""
         print(f"\n{Colors.CYAN}[*] Estado actual del repositorio:{Colors.ENDC}")
-        self._exec_command("git status -s")
+        self._exec_command(["git", "status", "-s"])
         
         # Mostrar último commit
         print(f"\n{Colors.CYAN}[*] Último commit:{Colors.ENDC}")
-        self._exec_command("git log -1 --oneline")
+        self._exec_command(["git", "log", "-1", "--oneline"])
+        print()
+
+    def _confirm(self, prompt):
+        """Pide confirmación al usuario (S por defecto); con --yes acepta sin preguntar"""
+        if self.args.yes:
+            return True
+        print(prompt, end="")
+        confirm = input().strip().lower()
+        return not confirm or confirm in ("s", "y")
+
+    def _print_summary(self, state, current_branch, commit_message):
+        """Muestra el resumen final sin volver a consultar git status ni git log"""
+        success, output = self._exec_command(["git", "rev-parse", "--short", "HEAD"], suppress_output=True)
+        commit_id = output.strip() if success else "?"
+        subject = commit_message.splitlines()[0] if commit_message else ""
+        destination = "sin push" if self.args.no_push else f"{self.args.remote}/{self.args.branch}"
+        
+        print(f"\n{Colors.CYAN}[*] Resumen:{Colors.ENDC}")
+        print(f"    Commit: {commit_id} {subject}")
+        print(f"    Rama: {current_branch} → {destination}")
+        print(f"    Entradas con cambios: {len(state['changes'])}")
         print()
 
-    def _check_changes(self):
+    def _check_changes(self, state):
         """Verifica si hay cambios para commitear"""
-        success, output = self._exec_command("git status --porcelain", suppress_output=True)
-        if not output.strip():
+        if not state['changes']:
             print(f"{Colors.YELLOW}[!] No hay cambios para commitear{Colors.ENDC}")
             return False
         return True
 
     def run(self):
         """Ejecuta el proceso principal"""
-        self._print_banner()
-        
         try:
+            self._cwd = os.getcwd()
+            # La instancia puede reutilizarse en otro repositorio: nada memorizado sirve
+            self._repo_state = None
+            self._current_branch = None
+            self._branch_exists = {}
+            
+            # Argumentos primero: --help o un error de uso no necesitan el banner
             self.args = self.parser.parse_args()
+            if sys.stdout.isatty() and not self.args.quiet:
+                self._print_banner()
             
-            # Verificar que estamos en un repositorio Git
-            if not self._validate_git_repo():
+            # Con la entrada redirigida (scripts, yes | ...) las confirmaciones son automáticas
+            if not self.args.yes and not sys.stdin.isatty():
+                self.args.yes = True
+            if self.args.yes:
+                self._verbose("Confirmación automática activada")
+            
+            # Verificar que estamos en un repositorio Git y leer su estado de una vez
+            state = self._collect_repo_state()
+            if state is None:
                 return 1
             
             # Mostrar información inicial
-            current_branch = self._get_current_branch()
-            print(f"{Colors.BLUE}[i] Repositorio: {os.path.basename(os.getcwd())}{Colors.ENDC}")
+            current_branch = self._get_current_branch(state)
+            print(f"{Colors.BLUE}[i] Repositorio: {os.path.basename(self._cwd)}{Colors.ENDC}")
             print(f"{Colors.BLUE}[i] Rama actual: {current_branch}{Colors.ENDC}")
             print(f"{Colors.BLUE}[i] Rama destino: {self.args.branch}{Colors.ENDC}")
             
@@ -181,60 +418,77 @@ class GitCommitTool:
                 self._show_status()
             
             # Verificar cambios
-            if not self._check_changes():
+            if not self._check_changes(state):
                 return 0
             
             # Obtener mensaje de commit
             commit_message = self._get_commit_message()
-            sanitized_message = self._sanitize_commit_message(commit_message)
             
             # Confirmar operación
             print(f"\n{Colors.CYAN}[*] Operaciones a realizar:{Colors.ENDC}")
-            print(f"{Colors.GREEN}    → Añadir cambios (git add .){Colors.ENDC}")
-            print(f"{Colors.GREEN}    → Commit con mensaje: \"{sanitized_message}\"{Colors.ENDC}")
+            if self.args.all:
+                print(f"{Colors.GREEN}    → Añadir cambios (git add .){Colors.ENDC}")
+            else:
+                print(f"{Colors.GREEN}    → Añadir cambios ({len(state['unstaged'])} rutas modificadas){Colors.ENDC}")
+            print(f"{Colors.GREEN}    → Commit con mensaje: \"{commit_message}\"{Colors.ENDC}")
             
+            # Si la rama remota no existe, su creación se confirma en la misma pregunta
+            prompt = "\n¿Proceder? [S/n]: "
+            creates_branch = False
             if not self.args.no_push:
                 print(f"{Colors.GREEN}    → Push a {self.args.remote}/{self.args.branch}{Colors.ENDC}")
+                if not self._validate_branch_exists(self.args.branch, self.args.remote):
+                    creates_branch = True
+                    print(f"{Colors.YELLOW}[!] La rama {self.args.branch} no existe en {self.args.remote}{Colors.ENDC}")
+                    prompt = f"\n¿Proceder y crear la rama {self.args.branch}? [S/n]: "
             
-            print("\n¿Proceder? [S/n]: ", end="")
-            confirm = input().strip().lower()
-            if confirm and confirm != "s" and confirm != "y":
+            if not self._confirm(prompt):
                 print(f"{Colors.YELLOW}[!] Operación cancelada por el usuario{Colors.ENDC}")
                 return 0
             
-            # Añadir cambios
-            print(f"\n{Colors.CYAN}[*] Añadiendo cambios...{Colors.ENDC}")
-            if not self._exec_command("git add .")[0]:
-                return 1
+            # El push creará la rama: la caché de ls-remote deja de ser válida. Se descarta
+            # antes de empezar, porque tras os.execvp ya no se puede actualizar
+            if creates_branch:
+                self._forget_remote_heads(self.args.remote)
             
-            # Hacer commit
-            print(f"{Colors.CYAN}[*] Haciendo commit...{Colors.ENDC}")
-            if not self._exec_command(f'git commit -m "{sanitized_message}"')[0]:
-                return 1
+            # El mensaje se pasa tal cual: sin shell no hace falta eliminar caracteres especiales
+            if self.args.all:
+                commands = [["git", "add", "."]]
+            else:
+                commands = self._add_commands(state['unstaged'])
+            commands.append(["git", "commit", "-m", commit_message])
             
-            # Hacer push si se solicita
+            push_argv = None
             if not self.args.no_push:
+                push_argv = ["git", "push", self.args.remote, f"{current_branch}:{self.args.branch}"]
+            
+            # Sin trabajo posterior al push, git puede reemplazar a este proceso (POSIX)
+            exec_push = push_argv is not None and not self.args.verbose and os.name == 'posix'
+            if push_argv is not None and not exec_push:
+                commands.append(push_argv)
+                print(f"\n{Colors.CYAN}[*] Añadiendo cambios, haciendo commit y push a {self.args.remote}/{self.args.branch}...{Colors.ENDC}")
+            else:
+                print(f"\n{Colors.CYAN}[*] Añadiendo cambios y haciendo commit...{Colors.ENDC}")
+            
+            # add, commit y push en secuencia, sin un shell intermedio
+            if not self._exec_batch(commands)[0]:
+                return 1
+            # Tras el commit el estado leído de git status ya no es válido
+            self._repo_state = None
+            
+            if exec_push:
+                print(f"\n{Colors.GREEN}[✓] Commit realizado{Colors.ENDC}")
                 print(f"{Colors.CYAN}[*] Haciendo push a {self.args.remote}/{self.args.branch}...{Colors.ENDC}")
-                
-                # Verificar si la rama remota existe
-                if not self._validate_branch_exists(self.args.branch, self.args.remote):
-                    print(f"{Colors.YELLOW}[!] La rama {self.args.branch} no existe en {self.args.remote}{Colors.ENDC}")
-                    print(f"{Colors.YELLOW}[!] ¿Deseas crearla? [S/n]: {Colors.ENDC}", end="")
-                    confirm = input().strip().lower()
-                    if confirm and confirm != "s" and confirm != "y":
-                        print(f"{Colors.YELLOW}[!] Push cancelado{Colors.ENDC}")
-                        return 0
-                
-                # Hacer push
-                push_cmd = f"git push {self.args.remote} {current_branch}:{self.args.branch}"
-                if not self._exec_command(push_cmd)[0]:
-                    return 1
+                sys.stdout.flush()
+                sys.stderr.flush()
+                # El código de salida de git push pasa a ser el de la herramienta
+                os.execvp("git", push_argv)
             
             print(f"\n{Colors.GREEN}[✓] ¡Operación completada con éxito!{Colors.ENDC}")
             
-            # Mostrar resumen final
+            # Mostrar resumen final (construido con el estado ya conocido)
             if self.args.verbose:
-                self._show_status()
+                self._print_summary(state, current_branch, commit_message)
             
             return 0
             
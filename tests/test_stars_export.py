@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Comprobaciones de la exportación de stars-git.py (python -m unittest discover tests)."""
+
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SOURCE = Path(__file__).resolve().parent.parent / 'Source' / 'stars-git.py'
+
+# El nombre del archivo lleva guion: se carga por ruta
+_spec = importlib.util.spec_from_file_location('stars_git', SOURCE)
+stars_git = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(stars_git)
+
+# Nodo GraphQL de un repositorio sin descripción
+NODE_WITHOUT_DESCRIPTION = {
+    'databaseId': 1,
+    'nameWithOwner': 'octocat/sin-descripcion',
+    'url': 'https://github.com/octocat/sin-descripcion',
+    'description': None,
+    'primaryLanguage': None,
+    'stargazerCount': 3,
+    'forkCount': 0,
+    'updatedAt': '2024-01-02T03:04:05Z',
+    'repositoryTopics': {'nodes': []},
+}
+
+class ExportNullDescriptionTest(unittest.TestCase):
+    def setUp(self):
+        self.repos = [stars_git._repo_from_node(NODE_WITHOUT_DESCRIPTION)]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        self.addCleanup(os.chdir, cwd)
+
+    def _export(self, format_type):
+        with mock.patch('builtins.print'):
+            stars_git.export_starred_repos(self.repos, format_type)
+        (filename,) = os.listdir('.')
+        return filename
+
+    def test_json_keeps_null_description(self):
+        # Con orjson y con el módulo json estándar
+        for orjson in (stars_git.orjson, None):
+            with self.subTest(orjson=orjson is not None), mock.patch.object(stars_git, 'orjson', orjson):
+                filename = self._export('json')
+                with open(filename, 'rb') as f:
+                    data = json.load(f)
+                os.remove(filename)
+                self.assertIsNone(data[0]['description'])
+
+    def test_csv_writes_empty_description_cell(self):
+        filename = self._export('csv')
+        with open(filename, newline='', encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[1][2], '')
+
+if __name__ == '__main__':
+    unittest.main()